@@ -0,0 +1,31 @@
+"""Riichi mahjong engine.
+
+Importing the package has no side effects: submodules, and anything heavy they
+build, are only loaded when one of the names below is first used."""
+from importlib import import_module
+
+_LAZY_ATTRIBUTES = {
+    'GameState': 'game_manager',
+    'Player': 'game_manager',
+    'Wall': 'wall',
+    'legal_actions': 'actions',
+    'Agent': 'match',
+    'RandomAgent': 'match',
+    'ShantenAgent': 'match',
+    'play_hand': 'match',
+    'play_match': 'match',
+    'encode_state': 'features',
+    'ShardWriter': 'features',
+    'run_league': 'league',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,144 @@
+from .enums import Calls
+from .agari import is_agari, get_waits, TERMINAL_AND_HONOR_KINDS
+from .utils import TILE_INDEX, TILE_KINDS, TILE_TYPES, tile_kind, hand_to_counts
+
+# Constants
+# Every action the acting seat can take is one bit of a plain int, so bots, the
+# server and training code can share one mask without building objects per action.
+DISCARD_OFFSET = 0
+'''Discard the tile at TILE_INDEX[tile].'''
+RIICHI_OFFSET = DISCARD_OFFSET + TILE_TYPES
+'''Declare riichi while discarding the tile at TILE_INDEX[tile].'''
+CLOSED_KAN_OFFSET = RIICHI_OFFSET + TILE_TYPES
+'''Closed kan of a tile kind (red fives folded).'''
+ADDED_KAN_OFFSET = CLOSED_KAN_OFFSET + TILE_KINDS
+'''Added kan onto an existing pon of a tile kind (red fives folded).'''
+TSUMO_ACTION = ADDED_KAN_OFFSET + TILE_KINDS
+KITA_ACTION = TSUMO_ACTION + 1
+KYUUSHU_ACTION = KITA_ACTION + 1
+'''Kyuushu kyuuhai: abort the hand with nine different terminals and honors on the first uninterrupted draw.'''
+ACTION_COUNT = KYUUSHU_ACTION + 1
+
+RIICHI_COST = 1000
+MAX_KANS = 4
+KYUUSHU_KINDS = 9
+NORTH_KIND = TILE_INDEX['4Z']
+_BIT_BYTES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def is_closed_hand(player) -> bool:
+    """Check if the player has only made calls that keep the hand closed."""
+    return all(call.call_type in (Calls.CLOSED_KAN, Calls.KITA) for call in player.calls)
+
+
+def is_first_uninterrupted_draw(player, game_state) -> bool:
+    """Check if the player is on their first draw of the hand and no one has made a call yet, kita included."""
+    return not player.discard_pile and not any(other.calls for other in game_state.players)
+
+
+def get_discard_mask(tiles: list[str], kuikae_restrictions: set[str] | None = None) -> int:
+    """Return the discard bits for the given tiles, minus any kuikae restrictions."""
+    mask = 0
+    for tile in tiles:
+        mask |= 1 << TILE_INDEX[tile]
+
+    if kuikae_restrictions:
+        for tile in kuikae_restrictions:
+            mask &= ~(1 << TILE_INDEX[tile])
+
+    return mask
+
+
+def legal_actions(player, game_state, call=None) -> int:
+    """Return a bitmask of every legal action for the acting seat.
+    \n Pass the CallOption the player just made to get the post-call discards, which honour its kuikae restrictions.
+    \n Tsumo is checked on hand shape only; yaku are left to scoring."""
+    if call is not None:
+        return get_discard_mask(player.hand, call.kuikae_restrictions)
+
+    drawn_tile = player.drawn_tile
+    tiles = player.hand + [drawn_tile] if drawn_tile else player.hand
+    counts = hand_to_counts(tiles)
+
+    if player.is_in_riichi and drawn_tile:
+        # The hand is locked, only the drawn tile may go.
+        mask = 1 << (DISCARD_OFFSET + TILE_INDEX[drawn_tile])
+    else:
+        mask = get_discard_mask(tiles)
+
+    if not drawn_tile:
+        return mask
+
+    if is_agari(counts):
+        mask |= 1 << TSUMO_ACTION
+
+    if is_first_uninterrupted_draw(player, game_state) and \
+            sum(1 for kind in TERMINAL_AND_HONOR_KINDS if counts[kind]) >= KYUUSHU_KINDS:
+        mask |= 1 << KYUUSHU_ACTION
+
+    if game_state.is_three_player and counts[NORTH_KIND] and game_state.tiles_left > 0:
+        # In riichi only a drawn North may go, a North in the locked hand could be part of the wait.
+        if not player.is_in_riichi or drawn_tile == '4Z':
+            mask |= 1 << KITA_ACTION
+
+    drawn_kind = tile_kind(TILE_INDEX[drawn_tile])
+    can_kan = game_state.kan_count < MAX_KANS and game_state.tiles_left > 0
+
+    if player.is_in_riichi:
+        # A closed kan in riichi is only allowed on the drawn tile, and only if the waits don't change.
+        if can_kan and counts[drawn_kind] == 4:
+            counts[drawn_kind] -= 1
+            waits = get_waits(counts)
+            counts[drawn_kind] -= 3
+            if get_waits(counts) == waits:
+                mask |= 1 << (CLOSED_KAN_OFFSET + drawn_kind)
+            counts[drawn_kind] += 4
+        return mask
+
+    if can_kan:
+        for kind in range(TILE_KINDS):
+            if counts[kind] == 4:
+                mask |= 1 << (CLOSED_KAN_OFFSET + kind)
+
+        for called in player.calls:
+            if called.call_type == Calls.PON and called.tiles:
+                kind = tile_kind(TILE_INDEX[called.tiles[0]])
+                if counts[kind]:
+                    mask |= 1 << (ADDED_KAN_OFFSET + kind)
+
+    if is_closed_hand(player) and player.points >= RIICHI_COST and game_state.tiles_left >= len(game_state.players):
+        tenpai_by_kind: dict[int, bool] = {}
+        for tile in set(tiles):
+            index = TILE_INDEX[tile]
+            kind = tile_kind(index)
+            if kind not in tenpai_by_kind:
+                counts[kind] -= 1
+                tenpai_by_kind[kind] = get_waits(counts) != 0
+                counts[kind] += 1
+            if tenpai_by_kind[kind]:
+                mask |= 1 << (RIICHI_OFFSET + index)
+
+    return mask
+
+
+def is_legal(mask: int, action: int) -> bool:
+    """Check if an action bit is set in a legal action mask."""
+    return (mask >> action) & 1 == 1
+
+
+def iter_actions(mask: int):
+    """Yield the index of every set action bit, lowest first."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def mask_to_array(mask: int, out: bytearray | None = None) -> bytearray:
+    """Write a legal action mask as ACTION_COUNT bytes of 0/1.
+    \n Pass a preallocated buffer to reuse it across calls."""
+    if out is None:
+        out = bytearray(ACTION_COUNT)
+    bits = format(mask, f"0{ACTION_COUNT}b")[::-1]
+    out[:] = bits.encode('ascii').translate(_BIT_BYTES)
+    return out
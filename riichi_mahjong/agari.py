@@ -0,0 +1,264 @@
+from operator import mul
+from .tables import get_tables, HONOR_SIZE, MAX_MELDS, POWERS_OF_FIVE, SUIT_SIZE
+from .utils import TILE_KINDS
+
+# Constants
+TERMINAL_AND_HONOR_KINDS = (0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33)
+TERMINAL_AND_HONOR_MASK = sum(1 << kind for kind in TERMINAL_AND_HONOR_KINDS)
+HONOR_START = 27
+GROUP_STARTS = (0, 9, 18, HONOR_START)
+GROUP_ENDS = (9, 18, HONOR_START, TILE_KINDS)
+GROUP_SIZES = (SUIT_SIZE, SUIT_SIZE, SUIT_SIZE, HONOR_SIZE)
+NO_DISTANCE = 99
+
+
+def is_suit_melds(suit_counts: list[int]) -> bool:
+    """Check if the counts of one number suit split exactly into sequences and triplets.
+    \n Scanning from the lowest value, whatever can't form triplets has to start sequences."""
+    c = list(suit_counts)
+    for i in range(9):
+        remainder = c[i] % 3
+        if remainder:
+            if i > 6 or c[i + 1] < remainder or c[i + 2] < remainder:
+                return False
+            c[i + 1] -= remainder
+            c[i + 2] -= remainder
+
+    return True
+
+
+def is_honor_melds(honor_counts: list[int]) -> bool:
+    """Check if honor counts split exactly into triplets."""
+    return all(count % 3 == 0 for count in honor_counts)
+
+
+def is_group_melds(counts: list[int], start: int) -> bool:
+    """Check one suit group (starting at 0, 9, 18 or 27) for an exact split into melds."""
+    if start == HONOR_START:
+        return is_honor_melds(counts[start:TILE_KINDS])
+    return is_suit_melds(counts[start:start + 9])
+
+
+def is_melds(counts: list[int]) -> bool:
+    """Check if all tile counts split exactly into melds."""
+    return all(is_group_melds(counts, start) for start in GROUP_STARTS)
+
+
+def is_chiitoitsu(counts: list[int]) -> bool:
+    """Check for seven distinct pairs."""
+    return sum(counts) == 14 and counts.count(2) == 7
+
+
+def is_kokushi(counts: list[int]) -> bool:
+    """Check for the thirteen orphans with one of them paired."""
+    return all(counts[kind] for kind in TERMINAL_AND_HONOR_KINDS) and \
+        sum(counts[kind] for kind in TERMINAL_AND_HONOR_KINDS) == 14 == sum(counts)
+
+
+def is_agari(counts: list[int]) -> bool:
+    """Check if the concealed tile counts form a complete hand.
+    \n Counts must be 3n + 2 tiles; melds already called are not included."""
+    total = sum(counts)
+    if total % 3 != 2:
+        return False
+
+    return is_standard_agari(counts) or total == 14 and (is_chiitoitsu(counts) or is_kokushi(counts))
+
+
+def is_standard_agari(counts: list[int]) -> bool:
+    """Check for four melds and a pair, or fewer melds when some were called.
+    \n Uses the hand tables when they have been built."""
+    tables = get_tables()
+    if tables is not None:
+        return is_standard_agari_from_tables(tables, counts)
+
+    # Every group but one must hold a multiple of three tiles, and that one holds the pair.
+    pair_start = -1
+    for start, end in zip(GROUP_STARTS, GROUP_ENDS):
+        remainder = sum(counts[start:end]) % 3
+        if remainder == 1:
+            return False
+        if remainder == 2:
+            if pair_start != -1:
+                return False
+            pair_start = start
+        elif not is_group_melds(counts, start):
+            return False
+
+    for kind in range(pair_start, GROUP_ENDS[GROUP_STARTS.index(pair_start)]):
+        if counts[kind] >= 2:
+            counts[kind] -= 2
+            complete = is_group_melds(counts, pair_start)
+            counts[kind] += 2
+            if complete:
+                return True
+
+    return False
+
+
+def is_standard_agari_from_tables(tables, counts: list[int]) -> bool:
+    """Check for a standard complete hand with one distance lookup per group.
+    \n A group is complete when it is 0 tiles away from exactly as many melds as its size allows."""
+    has_pair = False
+    for start, end in zip(GROUP_STARTS, GROUP_ENDS):
+        group_counts = counts[start:end]
+        total = sum(group_counts)
+        remainder = total % 3
+        if remainder == 1:
+            return False
+        if remainder == 2:
+            if has_pair:
+                return False
+            has_pair = True
+        key = sum(map(mul, group_counts, POWERS_OF_FIVE))
+        if tables.get_distance(start == HONOR_START, key, total // 3, remainder // 2):
+            return False
+
+    return True
+
+
+def get_shanten(counts: list[int], called_melds: int = 0) -> int:
+    """Return how many tiles the concealed hand is from tenpai: 0 is tenpai and -1 is complete.
+    \n Standard hands combine each group's distance table row; chiitoitsu and kokushi only count for closed hands.
+    \n Needs the hand tables built by 'riichi-mahjong build-tables'."""
+    tables = get_tables()
+    if tables is None:
+        raise FileNotFoundError("Hand tables have not been built, run 'riichi-mahjong build-tables'.")
+
+    melds_needed = MAX_MELDS - called_melds
+    best = [NO_DISTANCE] * (MAX_MELDS + 1) * 2
+    best[0] = 0
+    for start, size in zip(GROUP_STARTS, GROUP_SIZES):
+        key = sum(map(mul, counts[start:start + size], POWERS_OF_FIVE))
+        table = tables.honor_distance if start == HONOR_START else tables.suit_distance
+        row = table[key * len(best):(key + 1) * len(best)]
+
+        combined = [NO_DISTANCE] * len(best)
+        for melds in range(melds_needed + 1):
+            for pair in range(2):
+                distance = best[melds * 2 + pair]
+                if distance == NO_DISTANCE:
+                    continue
+                for group_melds in range(melds_needed - melds + 1):
+                    for group_pair in range(2 - pair):
+                        column = (melds + group_melds) * 2 + pair + group_pair
+                        combined[column] = min(combined[column], distance + row[group_melds * 2 + group_pair])
+        best = combined
+
+    shanten = best[melds_needed * 2 + 1] - 1
+    if called_melds == 0:
+        shanten = min(shanten, get_chiitoitsu_shanten(counts), get_kokushi_shanten(counts))
+
+    return shanten
+
+
+def get_chiitoitsu_shanten(counts: list[int]) -> int:
+    """Return the shanten for seven pairs, where pairs must be of different tiles."""
+    pairs = sum(1 for count in counts if count >= 2)
+    kinds = sum(1 for count in counts if count)
+    return 6 - pairs + max(0, 7 - kinds)
+
+
+def get_kokushi_shanten(counts: list[int]) -> int:
+    """Return the shanten for the thirteen orphans."""
+    kinds = sum(1 for kind in TERMINAL_AND_HONOR_KINDS if counts[kind])
+    has_pair = any(counts[kind] >= 2 for kind in TERMINAL_AND_HONOR_KINDS)
+    return 13 - kinds - has_pair
+
+
+def get_wait_candidates(counts: list[int]) -> int:
+    """Return a bitmask of tile kinds that could possibly be waits.
+    \n A wait has to be held already or sit within two of a held number tile, except for kokushi."""
+    candidates = 0
+    for kind in range(HONOR_START):
+        if counts[kind]:
+            value = kind % 9
+            low = kind - min(value, 2)
+            high = kind + min(8 - value, 2)
+            candidates |= ((1 << (high - low + 1)) - 1) << low
+
+    for kind in range(HONOR_START, TILE_KINDS):
+        if counts[kind]:
+            candidates |= 1 << kind
+
+    if sum(counts[kind] for kind in TERMINAL_AND_HONOR_KINDS) == 13:
+        candidates |= TERMINAL_AND_HONOR_MASK
+
+    return candidates
+
+
+def get_waits(counts: list[int]) -> int:
+    """Return a bitmask of tile kinds that would complete the concealed hand.
+    \n Kinds the hand already holds all four of can't be drawn, so they are never waits."""
+    tables = get_tables()
+    if tables is not None:
+        return get_waits_from_tables(tables, counts)
+
+    waits = 0
+    candidates = get_wait_candidates(counts)
+    while candidates:
+        lowest = candidates & -candidates
+        kind = lowest.bit_length() - 1
+        candidates ^= lowest
+        if counts[kind] < 4:
+            counts[kind] += 1
+            if is_agari(counts):
+                waits |= lowest
+            counts[kind] -= 1
+
+    return waits
+
+
+def get_waits_from_tables(tables, counts: list[int]) -> int:
+    """Find waits with the hand tables, re-keying only the group the added tile lands in.
+    \n Every other group has to be complete already, so at most one group is ever searched."""
+    keys = []
+    totals = []
+    incomplete = []
+    pair_count = 0
+    for start, end in zip(GROUP_STARTS, GROUP_ENDS):
+        group_counts = counts[start:end]
+        total = sum(group_counts)
+        key = sum(map(mul, group_counts, POWERS_OF_FIVE))
+        keys.append(key)
+        totals.append(total)
+        remainder = total % 3
+        pair_count += remainder == 2
+        if remainder == 1 or tables.get_distance(start == HONOR_START, key, total // 3, remainder // 2):
+            incomplete.append(start)
+
+    waits = 0
+    if len(incomplete) <= 1:
+        for group, start in enumerate(GROUP_STARTS):
+            if incomplete and incomplete[0] != start:
+                continue
+
+            total = totals[group] + 1
+            remainder = total % 3
+            old_pair = totals[group] % 3 == 2
+            if remainder == 1 or pair_count - old_pair + (remainder == 2) != 1:
+                continue
+
+            is_honor = start == HONOR_START
+            for i in range(GROUP_ENDS[group] - start):
+                if counts[start + i] < 4 and not tables.get_distance(
+                        is_honor, keys[group] + POWERS_OF_FIVE[i], total // 3, remainder // 2):
+                    waits |= 1 << (start + i)
+
+    if sum(totals) == 13:
+        # Seven pairs waits on its single tile, kokushi on whichever orphan completes it.
+        if counts.count(2) == 6 and counts.count(1) == 1:
+            waits |= 1 << counts.index(1)
+        if sum(counts[kind] for kind in TERMINAL_AND_HONOR_KINDS) == 13:
+            for kind in TERMINAL_AND_HONOR_KINDS:
+                counts[kind] += 1
+                if is_kokushi(counts):
+                    waits |= 1 << kind
+                counts[kind] -= 1
+
+    return waits
+
+
+def is_tenpai(counts: list[int]) -> bool:
+    """Check if the concealed hand is one tile away from complete."""
+    return get_waits(counts) != 0
@@ -1,7 +1,7 @@
-from utils import *
-from enums import Calls
 from dataclasses import dataclass
-from game_manager import Player, game_state
+from .enums import Calls
+from .game_manager import GameState, Player
+from .utils import extract_tile_list_values, extract_tile_values, get_next_enum, is_number_tile, sort_tiles
 
 
 @dataclass
@@ -34,6 +34,7 @@ def add_call_option(call_options: list[CallOption], call_type: Calls, tiles_used
 
 def get_last_discard() -> str:
     """Retrieve the last tile discarded by the previous player."""
+    game_state = GameState()
     previous_player_wind = game_state.previous_player
 
     for player in game_state.players:
@@ -70,8 +71,27 @@ def is_sequence(tiles: list[str]) -> bool:
         return False
 
 
+def _tile_variants(value: int, suit: str) -> set[str]:
+    """Return the tile names for a value, including the red five where it applies."""
+    variants = {f"{value}{suit}"}
+    if value == 5:
+        variants.add(f"0{suit}")
+    return variants
+
+
+def has_discard_after_call(hand: list[str], tiles_used: list[str], kuikae_restrictions: set[str]) -> bool:
+    """Check if a call would leave at least one tile that kuikae still allows discarding.
+    \n A call that leaves nothing to discard can't be made."""
+    remaining = list(hand)
+    for tile in tiles_used:
+        remaining.remove(tile)
+    return any(tile not in kuikae_restrictions for tile in remaining)
+
+
 def find_chii_options(hand: list[str], discard: str) -> list[CallOption]:
-    """Find all valid chii sequences using the discarded tile, handling red fives correctly."""
+    """Find all valid chii sequences using the discarded tile, handling red fives correctly.
+    \n The kuikae restrictions are the called tile itself plus, for an edge call, the tile on the far side (suji).
+    \n Sequences that would leave no legal discard are left out."""
     if not is_number_tile(discard):
         return []
 
@@ -82,63 +102,52 @@ def find_chii_options(hand: list[str], discard: str) -> list[CallOption]:
     hand_tiles = set(hand)
     chii_options: list[CallOption] = []
 
-    for offset in (-2, -1, 0):
-        n1, n2 = discard_value + offset, discard_value + offset + 1
+    for offset_1, offset_2, suji_offset in ((-2, -1, -3), (-1, 1, 0), (1, 2, 3)):
+        n1, n2 = discard_value + offset_1, discard_value + offset_2
 
         if 1 <= n1 <= 9 and 1 <= n2 <= 9:
-            possible_tiles_1 = {f"{n1}{suit}"}
-            possible_tiles_2 = {f"{n2}{suit}"}
-
-            if n1 == 5:
-                possible_tiles_1.add(f"0{suit}")
-            if n2 == 5:
-                possible_tiles_2.add(f"0{suit}")
+            possible_tiles_1 = _tile_variants(n1, suit)
+            possible_tiles_2 = _tile_variants(n2, suit)
 
             if hand_tiles & possible_tiles_1 and hand_tiles & possible_tiles_2:
-                kuikae: set[str] = set()
-
-                left_tile_val = discard_value - 1
-                right_tile_val = discard_value + 1
-
-                if discard_value > 1:
-                    possible_left = {f"{left_tile_val}{suit}"}
-                    if left_tile_val == 5:
-                        possible_left.add(f"0{suit}")
-                    if hand_tiles & possible_left:
-                        kuikae |= possible_left
+                kuikae = _tile_variants(discard_value, suit)
 
-                if discard_value < 9:
-                    possible_right = {f"{right_tile_val}{suit}"}
-                    if right_tile_val == 5:
-                        possible_right.add(f"0{suit}")
-                    if hand_tiles & possible_right:
-                        kuikae |= possible_right
+                suji_value = discard_value + suji_offset
+                if suji_offset and 1 <= suji_value <= 9:
+                    kuikae |= _tile_variants(suji_value, suit)
 
                 tiles_used = [next(tile for tile in hand if tile in possible_tiles_1),
                               next(tile for tile in hand if tile in possible_tiles_2)]
 
-                add_call_option(chii_options, Calls.CHII, tiles_used, kuikae)
+                if has_discard_after_call(hand, tiles_used, kuikae):
+                    add_call_option(chii_options, Calls.CHII, tiles_used, kuikae)
 
     return chii_options
 
 
 def check_kita(player: Player, call_options: list[CallOption]) -> None:
     """Check if the player can call Kita (4Z) based on their hand."""
-    if game_state.is_three_player and '4Z' in player.hand:
+    if GameState().is_three_player and '4Z' in player.hand:
         add_call_option(call_options, Calls.KITA, ['4Z'], set())
 
 
-def check_set_call(matching_tiles: list[str], last_discard: str, call_options: list[CallOption], call_type: Calls, count_required: int) -> None:
-    """Generic check for Pon/Open Kan."""
+def check_set_call(hand: list[str], matching_tiles: list[str], last_discard: str, call_options: list[CallOption], call_type: Calls, count_required: int) -> None:
+    """Generic check for Pon/Open Kan.
+    \n A pon that would leave no legal discard is left out; an open kan discards after its replacement draw."""
     if len(matching_tiles) >= count_required:
         meld = [last_discard] * (count_required - 1)
-        add_call_option(call_options, call_type, meld, {last_discard})
+        value, suit = extract_tile_values(last_discard)
+        kuikae = _tile_variants(value or 5, suit) if is_number_tile(last_discard) else {last_discard}
+        if call_type == Calls.PON and not has_discard_after_call(hand, meld, kuikae):
+            return
+        add_call_option(call_options, call_type, meld, kuikae)
 
 
 def check_chii(player: Player, last_discard: str, call_options: list[CallOption]) -> None:
     """Check if the player can call Chii based on their hand and the last discard."""
     if not is_number_tile(last_discard):
         return
+    game_state = GameState()
     # Only chii from the player to the left and not in 3-player games.
     if get_next_enum(game_state.previous_player) == game_state.current_player and not game_state.is_three_player:
         call_options.extend(find_chii_options(player.hand, last_discard))
@@ -169,9 +178,9 @@ def can_call(player: Player) -> list[CallOption]:
     matching_tiles = [tile for tile in player.hand if tile == last_discard]
 
     check_kita(player, call_options)
-    check_set_call(matching_tiles, last_discard, call_options, Calls.PON, 2)
+    check_set_call(player.hand, matching_tiles, last_discard, call_options, Calls.PON, 2)
     check_chii(player, last_discard, call_options)
-    check_set_call(matching_tiles, last_discard, call_options, Calls.OPEN_KAN, 3)
+    check_set_call(player.hand, matching_tiles, last_discard, call_options, Calls.OPEN_KAN, 3)
     check_closed_kan(player, call_options)
     check_added_kan(player, call_options)
 
@@ -0,0 +1,186 @@
+import argparse
+import os
+import sys
+import time
+from .tables import TABLES_ENV, DEFAULT_TABLES_PATH
+
+# Constants
+# Keep this module's top-level imports to the standard library and tables.py, which
+# maps nothing at import: everything else is imported inside the subcommand that
+# needs it, so starting the CLI or a worker stays cheap.
+COLD_START_BUDGET_MS = 50.0
+'''How long importing the package and CLI may add on top of bare interpreter startup.'''
+COLD_START_RUNS = 10
+
+
+def run_play(args: argparse.Namespace) -> None:
+    """Play an interactive game in the console."""
+    from .gameplay import run_game
+    run_game()
+
+
+def simulate_matches(task: tuple[int, list[int], int, bool, str | None]) -> list[tuple[list[int], list[int], int]]:
+    """Play a batch of matches in one worker, returning (placements, final points, hand count) per match.
+    \n When an export directory is given, every decision is written to that worker's own feature shards."""
+    from .match import RandomAgent, play_match
+
+    worker_index, seeds, player_count, is_east_only, export_directory = task
+    agents = [RandomAgent(seeds[0] + seat) if seeds else RandomAgent() for seat in range(player_count)]
+
+    writer = None
+    if export_directory is not None:
+        from .features import RecordingAgent, ShardWriter
+        writer = ShardWriter(export_directory, f"worker{worker_index:03d}")
+        agents = [RecordingAgent(agent, writer) for agent in agents]
+
+    results = []
+    for seed in seeds:
+        result = play_match(agents, is_east_only, seed)
+        results.append((result.placements, result.final_points, len(result.hands)))
+
+    if writer is not None:
+        writer.close()
+
+    return results
+
+
+def run_simulate(args: argparse.Namespace) -> None:
+    """Play matches between random agents across a process pool and print a summary."""
+    seeds = [args.seed + i for i in range(args.matches)]
+    workers = max(1, min(args.workers, args.matches))
+    tasks = [(i, seeds[i::workers], args.players, args.east_only, args.export) for i in range(workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        batches = [simulate_matches(tasks[0])]
+    else:
+        from multiprocessing import Pool
+        with Pool(workers) as pool:
+            batches = pool.map(simulate_matches, tasks)
+    elapsed = time.perf_counter() - start
+
+    results = [result for batch in batches for result in batch]
+    hand_count = sum(hands for _, _, hands in results)
+    print(f"{len(results)} matches, {hand_count} hands in {elapsed:.2f}s ({hand_count / elapsed:.1f} hands/s)")
+
+    for seat in range(args.players):
+        average_place = sum(placements[seat] for placements, _, _ in results) / len(results)
+        average_points = sum(points[seat] for _, points, _ in results) / len(results)
+        print(f"Seat {seat}: average place {average_place:.2f}, average points {average_points:.0f}")
+
+
+def measure_cold_start(code: str, runs: int) -> float:
+    """Return the fastest wall time, in milliseconds, of running code in a fresh interpreter."""
+    import subprocess
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [project_root, os.environ.get('PYTHONPATH')])))
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, env=env)
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def run_bench(args: argparse.Namespace) -> None:
+    """Measure cold start against COLD_START_BUDGET_MS and headless hand throughput.
+    \n Exits with status 1 when the cold start is over budget."""
+    interpreter_ms = measure_cold_start('pass', args.runs)
+    cli_ms = measure_cold_start('import riichi_mahjong.cli', args.runs)
+    overhead_ms = cli_ms - interpreter_ms
+    print(f"Cold start: {cli_ms:.1f}ms, {overhead_ms:.1f}ms over the interpreter (budget {COLD_START_BUDGET_MS:.0f}ms)")
+
+    from .game_manager import GameState, seat_players
+    from .match import RandomAgent, play_hand
+    from .tables import get_tables
+
+    start = time.perf_counter()
+    tables = get_tables()
+    if tables is None:
+        print("Hand tables: not built, falling back to pure Python hand checks")
+    else:
+        print(f"Hand tables: mapped {tables.path} in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    game_state = GameState()
+    agents = [RandomAgent(seat) for seat in range(args.players)]
+    seat_players(game_state, args.players)
+
+    start = time.perf_counter()
+    for seed in range(args.hands):
+        play_hand(game_state, agents, seed)
+    elapsed = time.perf_counter() - start
+    print(f"Headless play: {args.hands} hands in {elapsed:.2f}s ({args.hands / elapsed:.1f} hands/s)")
+
+    if overhead_ms > COLD_START_BUDGET_MS:
+        sys.exit(1)
+
+
+def run_league(args: argparse.Namespace) -> None:
+    """Compare agents over duplicate walls until one is clearly ahead or the difference is known to within --precision."""
+    from .league import run_league as play_league
+
+    try:
+        league = play_league(args.agents, args.east_only, args.seed, args.max_blocks, args.min_blocks,
+                             args.precision, args.workers)
+    except (ValueError, FileNotFoundError) as error:
+        sys.exit(f"riichi-mahjong league: {error}")
+    print(f"Stopped after {league.blocks} blocks.")
+
+
+def run_build_tables(args: argparse.Namespace) -> None:
+    """Generate the hand tables and write them where workers will map them."""
+    from .tables import build_tables
+
+    start = time.perf_counter()
+    build_tables(args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 2 ** 20:.1f} MiB) in {time.perf_counter() - start:.1f}s")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the play, simulate, bench, league and build-tables subcommands."""
+    parser = argparse.ArgumentParser(prog="riichi-mahjong", description="Riichi mahjong in the console.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    play = subparsers.add_parser("play", help="play an interactive game")
+    play.set_defaults(handler=run_play)
+
+    simulate = subparsers.add_parser("simulate", help="play headless matches between random agents")
+    simulate.add_argument("--matches", type=int, default=100)
+    simulate.add_argument("--players", type=int, choices=(3, 4), default=4)
+    simulate.add_argument("--east-only", action="store_true", help="play east-only matches instead of hanchan")
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    simulate.add_argument("--export", metavar="DIRECTORY", help="write every decision to .npy feature shards")
+    simulate.set_defaults(handler=run_simulate)
+
+    bench = subparsers.add_parser("bench", help="measure cold start and headless throughput")
+    bench.add_argument("--runs", type=int, default=COLD_START_RUNS)
+    bench.add_argument("--hands", type=int, default=50)
+    bench.add_argument("--players", type=int, choices=(3, 4), default=4)
+    bench.set_defaults(handler=run_bench)
+
+    league = subparsers.add_parser("league", help="compare agents over duplicate walls with seat rotation")
+    league.add_argument("agents", nargs="+", help="one agent name per seat, the first is the candidate (random, shanten)")
+    league.add_argument("--east-only", action="store_true", help="play east-only matches instead of hanchan")
+    league.add_argument("--seed", type=int, default=0)
+    league.add_argument("--max-blocks", type=int, default=1000)
+    league.add_argument("--min-blocks", type=int, default=10)
+    league.add_argument("--precision", type=float, default=0.05,
+                        help="stop once the placement difference's 95%% interval is this wide either side, "
+                             "or sooner once it is clearly not zero")
+    league.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    league.set_defaults(handler=run_league)
+
+    build_tables = subparsers.add_parser("build-tables", help="generate the memory-mapped hand tables")
+    build_tables.add_argument("--output", default=os.environ.get(TABLES_ENV, DEFAULT_TABLES_PATH))
+    build_tables.set_defaults(handler=run_build_tables)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the riichi-mahjong command."""
+    args = build_parser().parse_args(argv)
+    args.handler(args)
@@ -102,4 +102,12 @@ class Melds(Enum):
 
     SHOUMINKAN = 7
     '''Added quad.'''
-    ADDED_QUAD = 7 # alias
\ No newline at end of file
+    ADDED_QUAD = 7 # alias
+
+
+class HandOutcome(Enum):
+    TSUMO = 1
+    RON = 2
+    EXHAUSTIVE_DRAW = 3
+    '''Ryuukyoku, the wall ran out.'''
+    ABORTIVE_DRAW = 4
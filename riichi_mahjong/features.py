@@ -0,0 +1,196 @@
+import os
+from itertools import repeat
+from operator import attrgetter, is_
+import numpy as np
+from .enums import Calls, DiscardType, Winds
+from .match import Agent
+from .utils import TILE_INDEX, TILE_TYPES
+
+# Constants
+# A sample is one flat row of uint8 so whole shards can be written and memory-mapped
+# in one go. Tiles are stored as TILE_INDEX + 1, leaving 0 for an empty slot.
+SEATS = 4
+MAX_DISCARDS = 32
+MAX_CALLS = 4
+'''Pons, chiis and kans, which can't exceed four per seat. Kita is counted separately.'''
+CALL_WIDTH = 5 # call type + up to four tiles
+MAX_DORA_INDICATORS = 5
+
+HAND_OFFSET = 0
+DISCARDS_OFFSET = HAND_OFFSET + TILE_TYPES
+TSUMOGIRI_OFFSET = DISCARDS_OFFSET + SEATS * MAX_DISCARDS
+CALLS_OFFSET = TSUMOGIRI_OFFSET + SEATS * MAX_DISCARDS
+DORA_OFFSET = CALLS_OFFSET + SEATS * MAX_CALLS * CALL_WIDTH
+RIICHI_FLAGS_OFFSET = DORA_OFFSET + MAX_DORA_INDICATORS
+KITA_OFFSET = RIICHI_FLAGS_OFFSET + SEATS
+ROUND_WIND_INDEX = KITA_OFFSET + SEATS
+SEAT_WIND_INDEX = ROUND_WIND_INDEX + 1
+HONBA_INDEX = SEAT_WIND_INDEX + 1
+RIICHI_STICKS_INDEX = HONBA_INDEX + 1
+TILES_LEFT_INDEX = RIICHI_STICKS_INDEX + 1
+FEATURE_SIZE = TILES_LEFT_INDEX + 1
+
+TILE_CODE: dict[str, int] = {tile: index + 1 for tile, index in TILE_INDEX.items()}
+# Enum .value lookups dominate the encoder's profile, so enums are mapped through dicts.
+WIND_CODE: dict[Winds, int] = {wind: wind.value for wind in Winds}
+CALL_CODE: dict[Calls, int] = {call: call.value for call in Calls}
+_EMPTY_DISCARDS = bytes(MAX_DISCARDS)
+_EMPTY_CALLS = bytes(MAX_CALLS * CALL_WIDTH)
+# Discard piles are the bulk of a row, so they are mapped through C-level getters rather than a Python loop,
+# and tsumogiri flags are identity checks since hashing an enum runs Python code.
+_get_tile = attrgetter('tile')
+_get_discard_type = attrgetter('discard_type')
+_get_tile_code = TILE_CODE.__getitem__
+_HAND_UNITS: dict[str, int] = {tile: 1 << (8 * index) for tile, index in TILE_INDEX.items()}
+'''Each tile as a one in its own byte of an int, so summing a hand gives its counts as little-endian bytes.'''
+
+
+def _encode_calls(calls: list) -> tuple[bytes, int]:
+    """Return the call slots for a player's pons, chiis and kans, and their kita count."""
+    slots = bytearray()
+    kita_count = 0
+    for call in calls:
+        if call.call_type == Calls.KITA:
+            kita_count += 1
+            continue
+        slots.append(CALL_CODE[call.call_type])
+        slots += bytes([TILE_CODE[tile] for tile in call.tiles[:CALL_WIDTH - 1]]).ljust(CALL_WIDTH - 1, b'\0')
+
+    return bytes(slots[:MAX_CALLS * CALL_WIDTH]).ljust(MAX_CALLS * CALL_WIDTH, b'\0'), kita_count
+
+
+def encode_state(game_state, player, out: bytearray, offset: int = 0) -> None:
+    """Encode the table from one seat's perspective into FEATURE_SIZE bytes of out, starting at offset.
+    \n Seats are ordered relative to the player, so slot 0 is always the player and slot 1 the next to act.
+    \n Every row is encoded from the table alone, so samples can be taken from any state in any order."""
+    hand = sum(map(_HAND_UNITS.__getitem__, player.hand))
+    if player.drawn_tile:
+        hand += _HAND_UNITS[player.drawn_tile]
+
+    discards = [_EMPTY_DISCARDS] * SEATS
+    flags = [_EMPTY_DISCARDS] * SEATS
+    calls = [_EMPTY_CALLS] * SEATS
+    riichi = bytearray(SEATS)
+    kita = bytearray(SEATS)
+
+    players = game_state.players
+    player_count = len(players)
+    seat_code = WIND_CODE[player.seat]
+    for other in players:
+        slot = (WIND_CODE[other.seat] - seat_code) % player_count
+
+        pile = other.discard_pile[:MAX_DISCARDS]
+        if pile:
+            discards[slot] = bytes(map(_get_tile_code, map(_get_tile, pile))).ljust(MAX_DISCARDS, b'\0')
+            flags[slot] = bytes(map(is_, map(_get_discard_type, pile), repeat(DiscardType.TSUMOGIRI))).ljust(MAX_DISCARDS, b'\0')
+        if other.calls:
+            calls[slot], kita[slot] = _encode_calls(other.calls)
+        riichi[slot] = other.is_in_riichi
+
+    dora = bytes([TILE_CODE[tile] for tile in game_state.wall.get_revealed_dora_indicators()[:MAX_DORA_INDICATORS]])
+    tail = bytes((WIND_CODE[game_state.current_round_wind], seat_code, min(game_state.repeats, 255),
+                  min(game_state.riichi_bets, 255), game_state.tiles_left))
+    out[offset:offset + FEATURE_SIZE] = b''.join((hand.to_bytes(TILE_TYPES, 'little'), *discards, *flags, *calls,
+                                                  dora.ljust(MAX_DORA_INDICATORS, b'\0'), riichi, kita, tail))
+
+
+def unpack_features(rows: np.ndarray) -> dict[str, np.ndarray]:
+    """Split (N, FEATURE_SIZE) feature rows into named fixed-shape views without copying."""
+    n = rows.shape[0]
+    return {
+        'hand': rows[:, HAND_OFFSET:DISCARDS_OFFSET],
+        'discards': rows[:, DISCARDS_OFFSET:TSUMOGIRI_OFFSET].reshape(n, SEATS, MAX_DISCARDS),
+        'tsumogiri': rows[:, TSUMOGIRI_OFFSET:CALLS_OFFSET].reshape(n, SEATS, MAX_DISCARDS),
+        'calls': rows[:, CALLS_OFFSET:DORA_OFFSET].reshape(n, SEATS, MAX_CALLS, CALL_WIDTH),
+        'dora_indicators': rows[:, DORA_OFFSET:RIICHI_FLAGS_OFFSET],
+        'riichi': rows[:, RIICHI_FLAGS_OFFSET:KITA_OFFSET],
+        'kita': rows[:, KITA_OFFSET:ROUND_WIND_INDEX],
+        'round_wind': rows[:, ROUND_WIND_INDEX],
+        'seat_wind': rows[:, SEAT_WIND_INDEX],
+        'honba': rows[:, HONBA_INDEX],
+        'riichi_sticks': rows[:, RIICHI_STICKS_INDEX],
+        'tiles_left': rows[:, TILES_LEFT_INDEX],
+    }
+
+
+def get_shard_paths(directory: str, prefix: str, index: int) -> tuple[str, str]:
+    """Return the feature and label .npy paths for one shard."""
+    base = os.path.join(directory, f"{prefix}-{index:05d}")
+    return f"{base}-features.npy", f"{base}-labels.npy"
+
+
+def load_shard(directory: str, prefix: str, index: int) -> tuple[np.ndarray, np.ndarray]:
+    """Memory-map one shard's features and labels read-only."""
+    features_path, labels_path = get_shard_paths(directory, prefix, index)
+    return np.load(features_path, mmap_mode='r'), np.load(labels_path, mmap_mode='r')
+
+
+class ShardWriter():
+    """Class that streams labelled samples into memory-mapped .npy shards.
+    \n Each simulation worker should use its own prefix so shards never collide."""
+    def __init__(self, directory: str, prefix: str = "shard", shard_size: int = 65536) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.prefix: str = prefix
+        self.shard_size: int = shard_size
+        self.shard_index: int = 0
+        self.sample_count: int = 0
+
+        self.buffer: bytearray = bytearray(shard_size * FEATURE_SIZE)
+        self.labels: np.ndarray = np.zeros(shard_size, dtype=np.int16)
+
+    def __enter__(self) -> 'ShardWriter':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add(self, game_state, player, label: int) -> None:
+        """Encode one sample into the current shard, flushing it to disk once full."""
+        encode_state(game_state, player, self.buffer, self.sample_count * FEATURE_SIZE)
+        self.labels[self.sample_count] = label
+        self.sample_count += 1
+
+        if self.sample_count == self.shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered samples out as the next shard."""
+        count = self.sample_count
+        if count == 0:
+            return
+
+        features_path, labels_path = get_shard_paths(self.directory, self.prefix, self.shard_index)
+        rows = np.frombuffer(self.buffer, dtype=np.uint8, count=count * FEATURE_SIZE).reshape(count, FEATURE_SIZE)
+
+        features = np.lib.format.open_memmap(features_path, mode='w+', dtype=np.uint8, shape=rows.shape)
+        features[:] = rows
+        features.flush()
+        del features
+
+        labels = np.lib.format.open_memmap(labels_path, mode='w+', dtype=np.int16, shape=(count,))
+        labels[:] = self.labels[:count]
+        labels.flush()
+        del labels
+
+        self.shard_index += 1
+        self.sample_count = 0
+
+    def close(self) -> None:
+        """Flush any partial shard."""
+        self.flush()
+
+
+class RecordingAgent(Agent):
+    """Agent that wraps another and records every state it acts on, labelled with the action chosen."""
+    def __init__(self, agent: Agent, writer: ShardWriter) -> None:
+        self.agent = agent
+        self.writer = writer
+
+    def choose_action(self, game_state, player, actions: int) -> int:
+        action = self.agent.choose_action(game_state, player, actions)
+        self.writer.add(game_state, player, action)
+        return action
+
+    def choose_ron(self, game_state, player, tile: str) -> bool:
+        return self.agent.choose_ron(game_state, player, tile)
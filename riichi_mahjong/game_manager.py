@@ -0,0 +1,207 @@
+import random
+from .utils import send_input, send_message, sort_tiles, get_next_enum, get_prev_enum
+from .wall import Wall
+from .enums import Calls, Winds, Furiten, DiscardType
+
+HAND_SIZE = 13
+STARTING_POINTS = {3: 35000, 4: 25000}
+
+
+class DiscardedTile():
+    """Class representing a tile that has been discarded."""
+    def __init__(self) -> None:
+        self.tile: str = ''
+        self.discarded_by: Winds = Winds.EAST
+        self.discard_type: DiscardType = DiscardType.TSUMOGIRI
+
+
+class CalledTile():
+    """Class representing a tile that has been called (pon, chii, kan, etc.)."""
+    def __init__(self) -> None:
+        self.tiles: list[str] = []
+        self.call_type: Calls = Calls.NONE
+        self.called_from: Winds = Winds.EAST
+        self.discard_type: DiscardType = DiscardType.TEDASHI
+
+
+class Player():
+    """Class representing a player in the game."""
+    def __init__(self) -> None:
+        self.seat: Winds = Winds.EAST
+        self.points: int = 25000
+
+        self.drawn_tile: str = ""
+        self.hand: list[str] = []
+        self.calls: list[CalledTile] = []
+        self.discard_pile: list[DiscardedTile] = []
+
+        self.tenpai: bool = False
+        self.is_in_riichi: bool = False
+        self.furiten_status: Furiten = Furiten.NONE
+
+
+class GameState():
+    """Singleton class to manage the game state."""
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, 'initialized'):
+            return
+        self.initialized = True
+
+        self.wall = Wall()
+        self.tiles_left: int = 69
+        self.is_three_player: bool = False
+        self.is_east_only: bool = False
+
+        self.repeats: int = 0
+        self.kan_count: int = 0
+        self.pending_dora_reveals: int = 0
+        '''Kan dora from added kans, which are only revealed once the player discards.'''
+        self.riichi_bets: int = 0
+
+        self.turn_number: int = 0
+        self.round_number: int = 0
+
+        self.players: list[Player] = []
+        self.current_player: Winds = Winds.EAST
+        self.previous_player: Winds = Winds.EAST
+        self.current_round_wind: Winds = Winds.EAST
+
+    def get_current_player(self) -> Player:
+        return self.get_player(self.current_player)
+
+    def get_player(self, seat: Winds) -> Player:
+        for player in self.players:
+            if player.seat == seat:
+                return player
+        raise ValueError(f"No player found with seat {seat}")
+
+    def get_next_seat(self, seat: Winds) -> Winds:
+        """Get the seat that acts after the given one, skipping North in 3 player games."""
+        next_seat = get_next_enum(seat)
+        if self.is_three_player and next_seat == Winds.NORTH:
+            next_seat = get_next_enum(next_seat)
+        return next_seat
+
+    def get_prev_seat(self, seat: Winds) -> Winds:
+        """Get the seat that acts before the given one, skipping North in 3 player games."""
+        prev_seat = get_prev_enum(seat)
+        if self.is_three_player and prev_seat == Winds.NORTH:
+            prev_seat = get_prev_enum(prev_seat)
+        return prev_seat
+
+    def get_final_round_wind(self) -> Winds:
+        """Get the last round wind of the match, East for east-only games and South for hanchan."""
+        return Winds.EAST if self.is_east_only else Winds.SOUTH
+
+
+def setup_game() -> None:
+    """Setup the game by initializing players and the wall."""
+    player_count = int(send_input("How many players?: "))
+
+    while player_count not in (3, 4):
+        send_message("Please try again!")
+        player_count = int(send_input("How many players?: "))
+
+    game_state = GameState()
+    seat_players(game_state, player_count, shuffle=True)
+    start_hand(game_state)
+
+
+def seat_players(game_state: GameState, player_count: int, shuffle: bool = False) -> None:
+    """Seat the players for a new match, reusing the existing Player objects where possible.
+    \n Without shuffling, players[0] starts as the dealer."""
+    winds = [Winds.EAST, Winds.SOUTH, Winds.WEST, Winds.NORTH]
+    if shuffle:
+        random.shuffle(winds)
+
+    game_state.is_three_player = player_count == 3
+    if game_state.is_three_player:
+        winds.remove(Winds.NORTH)
+
+    while len(game_state.players) < player_count:
+        game_state.players.append(Player())
+    del game_state.players[player_count:]
+
+    for player in game_state.players:
+        player.seat = winds.pop(0)
+        player.points = STARTING_POINTS[player_count]
+
+    game_state.repeats = 0
+    game_state.riichi_bets = 0
+    game_state.round_number = 0
+    game_state.current_round_wind = Winds.EAST
+
+
+def start_hand(game_state: GameState, seed: int | None = None) -> None:
+    """Reset the table in place and deal a new hand."""
+    wall = game_state.wall
+    wall.setup_walls(game_state, seed)
+
+    for player in game_state.players:
+        player.hand = sort_tiles(wall.draw_tiles(HAND_SIZE))
+        player.drawn_tile = ""
+        player.calls.clear()
+        player.discard_pile.clear()
+        player.tenpai = False
+        player.is_in_riichi = False
+        player.furiten_status = Furiten.NONE
+
+    game_state.kan_count = 0
+    game_state.pending_dora_reveals = 0
+    game_state.turn_number = 0
+    game_state.current_player = Winds.EAST
+    game_state.previous_player = Winds.EAST
+    game_state.tiles_left = len(wall.wall)
+
+
+def end_hand(game_state: GameState, dealer_keeps: bool, add_repeat: bool) -> None:
+    """Advance the round counters after a hand.
+    \n When the dealer doesn't keep the seat, every seat wind rotates and the round number moves on."""
+    game_state.repeats = game_state.repeats + 1 if add_repeat else 0
+
+    if dealer_keeps:
+        return
+
+    for player in game_state.players:
+        player.seat = game_state.get_prev_seat(player.seat)
+
+    game_state.round_number += 1
+    if game_state.round_number == len(game_state.players):
+        game_state.round_number = 0
+        game_state.current_round_wind = get_next_enum(game_state.current_round_wind)
+
+
+def is_match_over(game_state: GameState) -> bool:
+    """Check if the match has ended, either by finishing the final round wind or by someone going below zero."""
+    if any(player.points < 0 for player in game_state.players):
+        return True
+
+    final_wind = game_state.get_final_round_wind()
+    return game_state.current_round_wind.value > final_wind.value
+
+
+def discard_tile(player: Player, tile: str, discard_type: DiscardType) -> None:
+    """Discard a tile from the player's hand and update their discard pile."""
+    discarded_by = player.seat
+    discard_pile = player.discard_pile
+
+    discarded_tile = DiscardedTile()
+    discarded_tile.tile = tile
+    discarded_tile.discarded_by = discarded_by
+    discarded_tile.discard_type = discard_type
+    discard_pile.append(discarded_tile)
+
+    if discard_type == DiscardType.TEDASHI:
+        player.hand.remove(tile)
+        player.hand.append(player.drawn_tile)
+
+    # Drawn tile always gets removed.
+    player.drawn_tile = ''
+    player.hand = sort_tiles(player.hand)
@@ -1,17 +1,19 @@
-from utils import *
-from enums import *
-from call_logic import can_call
-from game_manager import setup_game, Player, DiscardedTile, game_state
+from .enums import Calls, Dragons, DiscardType, Winds
+from .call_logic import can_call
+from .actions import legal_actions, is_legal, DISCARD_OFFSET
+from .game_manager import setup_game, discard_tile, GameState, Player
+from .utils import TILE_INDEX, extract_tile_values, is_number_tile, send_input, send_message
 
 
 def update_current_players(current_player: Player | None = None) -> None:
     """Update the current player to the next one in the game.
     \n If current_player is provided, it will set that player as the current player."""
+    game_state = GameState()
     game_state.previous_player = game_state.current_player
     if current_player is not None:
         game_state.current_player = current_player.seat
     else:
-        game_state.current_player = get_next_enum(game_state.current_player)
+        game_state.current_player = game_state.get_next_seat(game_state.current_player)
 
 
 def _format_calls(calls) -> str:
@@ -52,6 +54,7 @@ def normalize_tile_input(user_input: str) -> str:
 
 def display_current_players_status(current_player: Player) -> None:
     """Display the current player's status, including their hand, drawn tile, and discard pile."""
+    game_state = GameState()
     # Header with seat and round wind.
     header = f"Seat: {clarify_tile(current_player.seat, 2)} | Round wind: {clarify_tile(game_state.current_round_wind, 2)}"
     send_message(header)
@@ -106,38 +109,20 @@ def clarify_tile(tile_or_enum: str | Winds | Dragons, type: int) -> str:
     return "Unknown"
 
 
-def discard_tile(player: Player, tile: str, discard_type: DiscardType) -> None:
-    """Discard a tile from the player's hand and update their discard pile."""
-    discarded_by = player.seat
-    discard_pile = player.discard_pile
-
-    discarded_tile = DiscardedTile()
-    discarded_tile.tile = tile
-    discarded_tile.discarded_by = discarded_by
-    discarded_tile.discard_type = discard_type
-    discard_pile.append(discarded_tile)
-
-    if discard_type == DiscardType.TEDASHI:
-        player.hand.remove(tile)
-        player.hand.append(player.drawn_tile)
-
-    # Drawn tile always gets removed.
-    player.drawn_tile = ''
-    player.hand = sort_tiles(player.hand)
-
-
 def draw_and_discard_tile(current_player: Player) -> None:
     """Draw a tile from the wall and discard a tile from the current player's hand."""
+    game_state = GameState()
     game_state.turn_number += 1
     drawn_tile = game_state.wall.draw_tile()
     current_player.drawn_tile = drawn_tile
 
     display_current_players_status(current_player)
+    actions = legal_actions(current_player, game_state)
 
     tile_to_discard = send_input("What will you discard?: ")
     tile_to_discard = normalize_tile_input(tile_to_discard)
 
-    while tile_to_discard not in current_player.hand and tile_to_discard != current_player.drawn_tile:
+    while tile_to_discard not in TILE_INDEX or not is_legal(actions, DISCARD_OFFSET + TILE_INDEX[tile_to_discard]):
         send_message("Please try again!")
         tile_to_discard = send_input("What will you discard?: ")
         tile_to_discard = normalize_tile_input(tile_to_discard)
@@ -152,6 +137,7 @@ def draw_and_discard_tile(current_player: Player) -> None:
 def run_game() -> None:
     """Main function to run the game."""
     setup_game()
+    game_state = GameState()
     draw_and_discard_tile(game_state.get_current_player())
     update_current_players()
 
@@ -168,5 +154,3 @@ def run_game() -> None:
         for call in calls:
             if call.call_type == Calls.NONE:
                 continue
-
-run_game()
\ No newline at end of file
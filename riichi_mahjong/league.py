@@ -0,0 +1,228 @@
+import math
+from dataclasses import dataclass, field
+from .game_manager import STARTING_POINTS
+from .tables import get_tables
+from .match import RandomAgent, ShantenAgent, play_match
+
+# Constants
+AGENT_TYPES = {
+    'random': RandomAgent,
+    'shanten': ShantenAgent,
+}
+CONFIDENCE_Z = 1.959964
+'''Two-sided 95% normal quantile, which the t quantile approaches as blocks are added.'''
+SMALL_T_QUANTILES = {1: 12.706, 2: 4.303}
+'''Two-sided 95% t quantiles below 3 degrees of freedom, where the expansion in get_t_quantile drifts.'''
+SEQUENCE_ALPHA = 0.05
+'''Chance that the confidence sequence ever excludes a true difference of zero, however often it is checked.'''
+SEQUENCE_MIXTURE_BLOCKS = 20
+'''Block count at which the confidence sequence is tightest, so clear differences are called early.'''
+
+
+@dataclass
+class AgentStats:
+    matches: int = 0
+    placement_total: int = 0
+    score_total: int = 0
+    """Sum of final points minus starting points."""
+    hands: int = 0
+    wins: int = 0
+    deal_ins: int = 0
+
+    @property
+    def average_placement(self) -> float:
+        return self.placement_total / self.matches if self.matches else 0.0
+
+    @property
+    def average_score(self) -> float:
+        return self.score_total / self.matches if self.matches else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.hands if self.hands else 0.0
+
+    @property
+    def deal_in_rate(self) -> float:
+        return self.deal_ins / self.hands if self.hands else 0.0
+
+
+def get_t_quantile(degrees_of_freedom: int) -> float:
+    """Return the two-sided 95% Student's t quantile.
+    \n Uses the Cornish-Fisher expansion around the normal quantile, which is within 0.005 from 3 degrees of freedom."""
+    if degrees_of_freedom in SMALL_T_QUANTILES:
+        return SMALL_T_QUANTILES[degrees_of_freedom]
+
+    z = CONFIDENCE_Z
+    v = degrees_of_freedom
+    return (z + (z ** 3 + z) / (4 * v)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3)
+            + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * v ** 4))
+
+
+def get_lineups(agent_names: list[str]) -> list[list[str]]:
+    """Return every seat rotation of the agents, skipping rotations that seat the same names the same way."""
+    lineups: list[list[str]] = []
+    for shift in range(len(agent_names)):
+        lineup = agent_names[shift:] + agent_names[:shift]
+        if lineup not in lineups:
+            lineups.append(lineup)
+    return lineups
+
+
+def play_block(task: tuple[int, list[str], bool]) -> list[tuple[str, int, int, int, int, int]]:
+    """Play one wall seed once per seat rotation, so every agent is dealt the same walls from every seat.
+    \n Returns (agent name, placement, score, hands, wins, deal-ins) for every seat of every match."""
+    seed, agent_names, is_east_only = task
+    rows = []
+    for lineup in get_lineups(agent_names):
+        agents = [AGENT_TYPES[name](seed * len(lineup) + seat) for seat, name in enumerate(lineup)]
+        result = play_match(agents, is_east_only, seed)
+        starting_points = STARTING_POINTS[len(lineup)]
+
+        for seat, name in enumerate(lineup):
+            wins = sum(1 for hand in result.hands if hand.winner == seat)
+            deal_ins = sum(1 for hand in result.hands if hand.deal_in == seat)
+            rows.append((name, result.placements[seat], result.final_points[seat] - starting_points,
+                         len(result.hands), wins, deal_ins))
+
+    return rows
+
+
+@dataclass
+class League:
+    agent_names: list[str]
+    stats: dict[str, AgentStats] = field(default_factory=dict)
+    blocks: int = 0
+    differences: list[float] = field(default_factory=list)
+    """Per block, the baseline's average placement minus the candidate's, so positive favours the candidate."""
+
+    def __post_init__(self) -> None:
+        for name in self.agent_names:
+            self.stats.setdefault(name, AgentStats())
+
+    @property
+    def candidate(self) -> str:
+        return self.agent_names[0]
+
+    @property
+    def baseline(self) -> str | None:
+        """The first agent name that differs from the candidate, if any."""
+        return next((name for name in self.agent_names if name != self.candidate), None)
+
+    def add_block(self, rows: list[tuple[str, int, int, int, int, int]]) -> None:
+        """Add the results of one duplicate block."""
+        self.blocks += 1
+        block_placements: dict[str, list[int]] = {}
+        for name, placement, score, hands, wins, deal_ins in rows:
+            stats = self.stats[name]
+            stats.matches += 1
+            stats.placement_total += placement
+            stats.score_total += score
+            stats.hands += hands
+            stats.wins += wins
+            stats.deal_ins += deal_ins
+            block_placements.setdefault(name, []).append(placement)
+
+        if self.baseline is not None:
+            candidate = block_placements[self.candidate]
+            baseline = block_placements[self.baseline]
+            self.differences.append(sum(baseline) / len(baseline) - sum(candidate) / len(candidate))
+
+    def get_confidence_interval(self) -> tuple[float, float, float] | None:
+        """Return (mean, lower, upper) for the placement difference, or None before there are two blocks."""
+        count = len(self.differences)
+        if count < 2:
+            return None
+
+        mean = sum(self.differences) / count
+        variance = sum((difference - mean) ** 2 for difference in self.differences) / (count - 1)
+        half_width = get_t_quantile(count - 1) * math.sqrt(variance / count)
+        return mean, mean - half_width, mean + half_width
+
+    def get_confidence_sequence(self) -> tuple[float, float, float] | None:
+        """Return (mean, lower, upper) for the placement difference from a normal mixture confidence sequence.
+        \n Unlike the fixed interval it holds at every block at once, so it can be checked after each block
+        and the comparison stopped once it excludes zero, without inflating the false positive rate.
+        \n The variance is the sample estimate, so it is only approximately valid while few blocks are in."""
+        count = len(self.differences)
+        if count < 2:
+            return None
+
+        mean = sum(self.differences) / count
+        variance = sum((difference - mean) ** 2 for difference in self.differences) / (count - 1)
+        # Robbins' two-sided normal mixture boundary on the sum, with the mixture variance set to
+        # SEQUENCE_MIXTURE_BLOCKS blocks' worth.
+        spread = count + SEQUENCE_MIXTURE_BLOCKS
+        boundary = variance * spread * math.log(spread / (SEQUENCE_MIXTURE_BLOCKS * SEQUENCE_ALPHA ** 2))
+        half_width = math.sqrt(boundary) / count
+        return mean, mean - half_width, mean + half_width
+
+    def is_decided(self, min_blocks: int, precision: float) -> bool:
+        """Check if the comparison can stop, once the confidence sequence excludes zero
+        or the interval is no wider than precision either side.
+        \n min_blocks keeps an early low variance estimate from stopping it."""
+        if len(self.differences) < max(min_blocks, 2):
+            return False
+
+        mean, lower, upper = self.get_confidence_sequence()
+        if lower > 0 or upper < 0:
+            return True
+
+        mean, lower, upper = self.get_confidence_interval()
+        return upper - mean <= precision
+
+    def format_progress(self) -> str:
+        """Describe the standings so far on one line per agent, followed by the rating difference."""
+        lines = [f"Block {self.blocks}:"]
+        for name, stats in self.stats.items():
+            lines.append(f"  {name}: place {stats.average_placement:.2f}, score {stats.average_score:+.0f}, "
+                         f"win {stats.win_rate:.1%}, deal-in {stats.deal_in_rate:.1%} ({stats.matches} seats)")
+
+        interval = self.get_confidence_interval()
+        if interval is not None:
+            mean, lower, upper = interval
+            lines.append(f"  {self.candidate} vs {self.baseline}: placement difference {mean:+.3f} [{lower:+.3f}, {upper:+.3f}]")
+
+        return "\n".join(lines)
+
+
+def run_league(agent_names: list[str], is_east_only: bool = False, seed: int = 0, max_blocks: int = 1000,
+               min_blocks: int = 10, precision: float = 0.05, workers: int = 1, report=print) -> League:
+    """Play duplicate blocks until one agent is clearly ahead, the placement difference is known to within precision,
+    or max_blocks have been played.
+    \n Blocks are spread over a process pool and reported as they finish; leftover work is dropped once decided.
+    \n The lineup is checked before any pool starts, so a bad one fails here rather than inside a worker."""
+    if len(agent_names) not in STARTING_POINTS:
+        raise ValueError(f"A league needs one agent per seat, 3 or 4 agents, got {len(agent_names)}")
+
+    for name in agent_names:
+        if name not in AGENT_TYPES:
+            raise ValueError(f"Unknown agent {name!r}, expected one of {', '.join(AGENT_TYPES)}")
+
+    needs_tables = [name for name in agent_names if AGENT_TYPES[name].needs_tables]
+    if needs_tables and get_tables() is None:
+        raise FileNotFoundError(f"The {needs_tables[0]} agent needs the hand tables, run 'riichi-mahjong build-tables'.")
+
+    league = League(list(agent_names))
+    tasks = ((seed + block, list(agent_names), is_east_only) for block in range(max_blocks))
+
+    pool = None
+    if workers > 1:
+        from multiprocessing import Pool
+        pool = Pool(workers)
+        results = pool.imap_unordered(play_block, tasks)
+    else:
+        results = map(play_block, tasks)
+
+    try:
+        for rows in results:
+            league.add_block(rows)
+            report(league.format_progress())
+            if league.is_decided(min_blocks, precision):
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    return league
@@ -0,0 +1,404 @@
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from .enums import Calls, DiscardType, Furiten, HandOutcome, Winds
+from .agari import is_agari, get_waits, get_shanten, is_tenpai
+from .actions import legal_actions, is_legal, iter_actions, DISCARD_OFFSET, RIICHI_OFFSET, CLOSED_KAN_OFFSET, \
+    ADDED_KAN_OFFSET, TSUMO_ACTION, KITA_ACTION, KYUUSHU_ACTION, RIICHI_COST, MAX_KANS
+from .game_manager import GameState, Player, CalledTile, seat_players, start_hand, end_hand, is_match_over, \
+    discard_tile
+from .scoring import count_han, get_ron_points, get_tsumo_payments, HONBA_VALUE, RIICHI_STICK_VALUE
+from .utils import INDEX_TILE, TILE_INDEX, TILE_TYPES, hand_to_counts, sort_tiles, tile_kind
+
+# Constants
+NOTEN_PAYMENT = 1000
+'''Paid into the noten pool per other seat, so 3000 in 4 player games and 2000 in 3 player games.'''
+DISCARD_ACTIONS = ((1 << TILE_TYPES) - 1) << DISCARD_OFFSET
+RIICHI_ACTIONS = ((1 << TILE_TYPES) - 1) << RIICHI_OFFSET
+WIND_TILES = ('1Z', '2Z', '3Z', '4Z')
+
+
+@dataclass
+class HandResult:
+    outcome: HandOutcome
+    point_changes: list[int]
+    """Indexed like GameState.players, which never reorders during a match."""
+    winner: int | None = None
+    deal_in: int | None = None
+    han: int = 0
+
+
+@dataclass
+class MatchResult:
+    final_points: list[int]
+    placements: list[int]
+    """1 for first place. Ties go to whoever started closer to the first dealer."""
+    hands: list[HandResult] = field(default_factory=list)
+
+
+class Agent(ABC):
+    """Base class for a headless player.
+    \n Agents are handed the legal action mask from actions.legal_actions and return one of its set bits.
+    \n Subclasses must implement choose_action, or they can't be constructed."""
+    needs_tables: bool = False
+    '''Whether the agent can only play with the hand tables built.'''
+
+    @abstractmethod
+    def choose_action(self, game_state: GameState, player: Player, actions: int) -> int:
+        """Return one of the set bits of the legal action mask."""
+
+    def choose_ron(self, game_state: GameState, player: Player, tile: str) -> bool:
+        """Decide whether to call ron on a discard. Wins are always taken by default."""
+        return True
+
+
+class RandomAgent(Agent):
+    """Agent that takes every win, riichi and kita it can, and otherwise discards at random."""
+    def __init__(self, seed: int | None = None) -> None:
+        self.rng = random.Random(seed)
+
+    def choose_action(self, game_state: GameState, player: Player, actions: int) -> int:
+        if is_legal(actions, TSUMO_ACTION):
+            return TSUMO_ACTION
+        if is_legal(actions, KITA_ACTION):
+            return KITA_ACTION
+
+        riichi_actions = actions & RIICHI_ACTIONS
+        if riichi_actions:
+            return self.rng.choice(list(iter_actions(riichi_actions)))
+
+        return self.rng.choice(list(iter_actions(actions & DISCARD_ACTIONS)))
+
+
+class ShantenAgent(Agent):
+    """Agent that takes every win, riichi and kita it can, and otherwise discards whatever leaves the lowest shanten.
+    \n Ties are broken at random. Needs the hand tables."""
+    needs_tables = True
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.rng = random.Random(seed)
+
+    def choose_action(self, game_state: GameState, player: Player, actions: int) -> int:
+        if is_legal(actions, TSUMO_ACTION):
+            return TSUMO_ACTION
+        if is_legal(actions, KITA_ACTION):
+            return KITA_ACTION
+
+        riichi_actions = actions & RIICHI_ACTIONS
+        if riichi_actions:
+            return self.rng.choice(list(iter_actions(riichi_actions)))
+
+        discards = list(iter_actions(actions & DISCARD_ACTIONS))
+        if len(discards) == 1:
+            return discards[0]
+
+        counts = hand_to_counts(player.hand + [player.drawn_tile])
+        called_melds = sum(1 for call in player.calls if call.call_type != Calls.KITA)
+        best_shanten = None
+        best_discards: list[int] = []
+        for action in discards:
+            kind = tile_kind(action - DISCARD_OFFSET)
+            counts[kind] -= 1
+            shanten = get_shanten(counts, called_melds)
+            counts[kind] += 1
+
+            if best_shanten is None or shanten < best_shanten:
+                best_shanten = shanten
+                best_discards = [action]
+            elif shanten == best_shanten:
+                best_discards.append(action)
+
+        return self.rng.choice(best_discards)
+
+
+def draw_replacement(game_state: GameState, player: Player) -> None:
+    """Give the player a replacement tile from the dead wall."""
+    wall = game_state.wall
+    player.drawn_tile = wall.draw_replacement_tile()
+    game_state.tiles_left = len(wall.wall)
+
+
+def remove_tiles_of_kind(player: Player, kind: int, amount: int) -> list[str]:
+    """Take tiles of a kind out of the player's hand and drawn tile, leaving the rest as the hand."""
+    tiles = player.hand + [player.drawn_tile]
+    removed = [tile for tile in tiles if tile_kind(TILE_INDEX[tile]) == kind][:amount]
+    for tile in removed:
+        tiles.remove(tile)
+
+    player.hand = sort_tiles(tiles)
+    player.drawn_tile = ''
+    return removed
+
+
+def declare_call(game_state: GameState, player: Player, action: int) -> None:
+    """Apply a closed kan, added kan or kita action and draw the replacement tile.
+    \n A closed kan's dora is revealed straight away, an added kan's only once the player discards,
+    so a win on the replacement tile doesn't count it."""
+    if action == KITA_ACTION:
+        called = CalledTile()
+        if player.is_in_riichi:
+            # The hand is locked, so the North has to be the drawn tile.
+            called.tiles = [player.drawn_tile]
+            player.drawn_tile = ''
+        else:
+            called.tiles = remove_tiles_of_kind(player, TILE_INDEX['4Z'], 1)
+        called.call_type = Calls.KITA
+        called.called_from = player.seat
+        player.calls.append(called)
+
+    elif action < ADDED_KAN_OFFSET:
+        called = CalledTile()
+        called.tiles = remove_tiles_of_kind(player, action - CLOSED_KAN_OFFSET, 4)
+        called.call_type = Calls.CLOSED_KAN
+        called.called_from = player.seat
+        player.calls.append(called)
+
+    else:
+        kind = action - ADDED_KAN_OFFSET
+        for called in player.calls:
+            if called.call_type == Calls.PON and tile_kind(TILE_INDEX[called.tiles[0]]) == kind:
+                called.tiles += remove_tiles_of_kind(player, kind, 1)
+                called.call_type = Calls.ADDED_KAN
+                break
+
+    if action != KITA_ACTION:
+        # A kan made before an added kan's discard flips that kan's dora first.
+        reveal_pending_dora(game_state)
+        game_state.kan_count += 1
+        if action >= ADDED_KAN_OFFSET:
+            game_state.pending_dora_reveals += 1
+        else:
+            game_state.wall.reveal_dora_indicator()
+
+    draw_replacement(game_state, player)
+
+
+def reveal_pending_dora(game_state: GameState) -> None:
+    """Flip the kan dora held back by added kans."""
+    while game_state.pending_dora_reveals:
+        game_state.pending_dora_reveals -= 1
+        game_state.wall.reveal_dora_indicator()
+
+
+def take_turn(game_state: GameState, player: Player, agent: Agent) -> tuple[int, int, int]:
+    """Let the player act on their drawn tile until they discard or win.
+    \n Returns the final action with its han and fu, which only mean anything for tsumo."""
+    while True:
+        actions = legal_actions(player, game_state)
+        han, fu = 0, 0
+        if is_legal(actions, TSUMO_ACTION):
+            han, fu = count_han(game_state, player, player.drawn_tile, True)
+            if not han:
+                actions &= ~(1 << TSUMO_ACTION)
+
+        action = agent.choose_action(game_state, player, actions)
+        if not is_legal(actions, action):
+            raise ValueError(f"Illegal action {action} for seat {player.seat}")
+
+        if action < CLOSED_KAN_OFFSET or action in (TSUMO_ACTION, KYUUSHU_ACTION):
+            return action, han, fu
+
+        declare_call(game_state, player, action)
+
+
+def find_ron(game_state: GameState, agents: list[Agent], discarder: Player, tile: str) -> tuple[int, int, int] | None:
+    """Offer the discard to every other seat in turn order, returning (player index, han, fu) for the first ron.
+    \n Players who pass on a win, or can't ron it for lack of yaku, become furiten until their next discard,
+    or for the rest of the hand in riichi."""
+    kind = tile_kind(TILE_INDEX[tile])
+    players = game_state.players
+    seat = game_state.get_next_seat(discarder.seat)
+
+    while seat != discarder.seat:
+        player = game_state.get_player(seat)
+        seat = game_state.get_next_seat(seat)
+
+        counts = hand_to_counts(player.hand)
+        counts[kind] += 1
+        if not is_agari(counts):
+            continue
+
+        counts[kind] -= 1
+        waits = get_waits(counts)
+        if player.furiten_status != Furiten.NONE or any(
+                waits >> tile_kind(TILE_INDEX[discard.tile]) & 1 for discard in player.discard_pile):
+            continue
+
+        han, fu = count_han(game_state, player, tile, False)
+        index = players.index(player)
+        if han and agents[index].choose_ron(game_state, player, tile):
+            return index, han, fu
+
+        # Missing a winning tile, even for lack of yaku, makes the player furiten.
+        player.furiten_status = Furiten.PERMANENT if player.is_in_riichi else Furiten.TEMPORARY
+
+    return None
+
+
+def settle_tsumo(game_state: GameState, winner: int, han: int, fu: int) -> HandResult:
+    """Pay out a tsumo win, including honba and riichi sticks."""
+    players = game_state.players
+    is_dealer = players[winner].seat == Winds.EAST
+    dealer_payment, payment = get_tsumo_payments(han, fu, is_dealer)
+    honba_payment = game_state.repeats * HONBA_VALUE // 3
+
+    changes = [0] * len(players)
+    for i, player in enumerate(players):
+        if i != winner:
+            paid = (dealer_payment if player.seat == Winds.EAST else payment) + honba_payment
+            changes[i] -= paid
+            changes[winner] += paid
+
+    changes[winner] += game_state.riichi_bets * RIICHI_STICK_VALUE
+    game_state.riichi_bets = 0
+    apply_point_changes(game_state, changes)
+    end_hand(game_state, dealer_keeps=is_dealer, add_repeat=is_dealer)
+    return HandResult(HandOutcome.TSUMO, changes, winner=winner, han=han)
+
+
+def settle_ron(game_state: GameState, winner: int, deal_in: int, han: int, fu: int) -> HandResult:
+    """Pay out a ron win, including honba and riichi sticks."""
+    players = game_state.players
+    is_dealer = players[winner].seat == Winds.EAST
+    paid = get_ron_points(han, fu, is_dealer) + game_state.repeats * HONBA_VALUE
+
+    changes = [0] * len(players)
+    changes[deal_in] -= paid
+    changes[winner] += paid + game_state.riichi_bets * RIICHI_STICK_VALUE
+    game_state.riichi_bets = 0
+    apply_point_changes(game_state, changes)
+    end_hand(game_state, dealer_keeps=is_dealer, add_repeat=is_dealer)
+    return HandResult(HandOutcome.RON, changes, winner=winner, deal_in=deal_in, han=han)
+
+
+def settle_exhaustive_draw(game_state: GameState) -> HandResult:
+    """Settle a hand where the wall ran out, with noten players paying tenpai players.
+    \n Riichi sticks stay on the table and the dealer keeps the seat if tenpai."""
+    players = game_state.players
+    for player in players:
+        player.tenpai = is_tenpai(hand_to_counts(player.hand))
+
+    tenpai_count = sum(player.tenpai for player in players)
+    changes = [0] * len(players)
+    if 0 < tenpai_count < len(players):
+        pool = NOTEN_PAYMENT * (len(players) - 1)
+        for i, player in enumerate(players):
+            if player.tenpai:
+                changes[i] = pool // tenpai_count
+            else:
+                changes[i] = -pool // (len(players) - tenpai_count)
+
+    apply_point_changes(game_state, changes)
+    dealer_tenpai = game_state.get_player(Winds.EAST).tenpai
+    end_hand(game_state, dealer_keeps=dealer_tenpai, add_repeat=True)
+    return HandResult(HandOutcome.EXHAUSTIVE_DRAW, changes)
+
+
+def settle_abortive_draw(game_state: GameState) -> HandResult:
+    """Settle an abortive draw: no payments, the dealer repeats and riichi sticks carry over."""
+    end_hand(game_state, dealer_keeps=True, add_repeat=True)
+    return HandResult(HandOutcome.ABORTIVE_DRAW, [0] * len(game_state.players))
+
+
+def apply_point_changes(game_state: GameState, changes: list[int]) -> None:
+    """Add the point changes to each player."""
+    for player, change in zip(game_state.players, changes):
+        player.points += change
+
+
+def is_abortive_draw(game_state: GameState) -> bool:
+    """Check for the abortive draws that can happen once a discard has passed.
+    \n Suufon renda: all four first discards are the same wind, with no calls made.
+    \n Suucha riichi: all four players are in riichi.
+    \n Suukaikan: four kans have been made, but not all by the same player.
+    \n Only suukaikan applies to 3 player games."""
+    players = game_state.players
+    if not game_state.is_three_player:
+        # Without calls, turn_number == 4 means everyone has made exactly one discard.
+        if game_state.turn_number == len(players) and game_state.kan_count == 0:
+            first_discards = {player.discard_pile[0].tile for player in players}
+            if len(first_discards) == 1 and first_discards.pop() in WIND_TILES:
+                return True
+
+        if all(player.is_in_riichi for player in players):
+            return True
+
+    if game_state.kan_count == MAX_KANS:
+        kan_players = [player for player in players
+                       if any(call.call_type in (Calls.CLOSED_KAN, Calls.ADDED_KAN, Calls.OPEN_KAN) for call in player.calls)]
+        return len(kan_players) > 1
+
+    return False
+
+
+def play_hand(game_state: GameState, agents: list[Agent], seed: int | None = None) -> HandResult:
+    """Deal and play one hand headlessly, then settle it and advance the round.
+    \n Agents are matched to players by index, and the table is reset in place rather than rebuilt."""
+    start_hand(game_state, seed)
+    wall = game_state.wall
+    players = game_state.players
+
+    while game_state.tiles_left > 0:
+        player = game_state.get_current_player()
+        index = players.index(player)
+
+        player.drawn_tile = wall.draw_tile()
+        game_state.tiles_left = len(wall.wall)
+        game_state.turn_number += 1
+
+        action, han, fu = take_turn(game_state, player, agents[index])
+        if action == TSUMO_ACTION:
+            return settle_tsumo(game_state, index, han, fu)
+        if action == KYUUSHU_ACTION:
+            return settle_abortive_draw(game_state)
+
+        is_riichi = action >= RIICHI_OFFSET
+        tile = INDEX_TILE[action - RIICHI_OFFSET if is_riichi else action - DISCARD_OFFSET]
+        discard_type = DiscardType.TSUMOGIRI if tile == player.drawn_tile else DiscardType.TEDASHI
+        discard_tile(player, tile, discard_type)
+        reveal_pending_dora(game_state)
+        if player.furiten_status == Furiten.TEMPORARY:
+            player.furiten_status = Furiten.NONE
+
+        ron = find_ron(game_state, agents, player, tile)
+        if ron is not None:
+            winner, han, fu = ron
+            return settle_ron(game_state, winner, index, han, fu)
+
+        if is_riichi:
+            player.is_in_riichi = True
+            player.points -= RIICHI_COST
+            game_state.riichi_bets += 1
+
+        if is_abortive_draw(game_state):
+            return settle_abortive_draw(game_state)
+
+        game_state.previous_player = game_state.current_player
+        game_state.current_player = game_state.get_next_seat(game_state.current_player)
+
+    return settle_exhaustive_draw(game_state)
+
+
+def play_match(agents: list[Agent], is_east_only: bool = False, seed: int | None = None) -> MatchResult:
+    """Play a full east-only or hanchan match headlessly, with 3 or 4 agents.
+    \n Hand k of any two matches with the same seed is dealt from the same wall."""
+    game_state = GameState()
+    game_state.is_east_only = is_east_only
+    seat_players(game_state, len(agents))
+    rng = random.Random(seed)
+
+    hands: list[HandResult] = []
+    while not is_match_over(game_state):
+        hands.append(play_hand(game_state, agents, rng.getrandbits(64)))
+
+    players = game_state.players
+    order = sorted(range(len(players)), key=lambda i: (-players[i].points, i))
+    # Leftover riichi sticks go to first place.
+    players[order[0]].points += game_state.riichi_bets * RIICHI_STICK_VALUE
+    game_state.riichi_bets = 0
+
+    placements = [0] * len(players)
+    for place, i in enumerate(order, start=1):
+        placements[i] = place
+
+    return MatchResult([player.points for player in players], placements, hands)
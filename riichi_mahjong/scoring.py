@@ -0,0 +1,127 @@
+from .enums import Calls
+from .actions import is_closed_hand
+from .agari import is_chiitoitsu, is_kokushi, TERMINAL_AND_HONOR_KINDS
+from .tables import get_tables
+from .utils import TILE_INDEX, hand_to_counts, tile_kind
+
+# Constants
+DEFAULT_FU = 30
+CHIITOITSU_FU = 25
+YAKUMAN_HAN = 13
+HONBA_VALUE = 300
+RIICHI_STICK_VALUE = 1000
+
+LIMIT_HANDS = ((13, 8000), (11, 6000), (8, 4000), (6, 3000), (5, 2000))
+'''(minimum han, base points) for yakuman, sanbaiman, baiman, haneman and mangan.'''
+MANGAN_BASE_POINTS = 2000
+POINT_TABLE_COLUMNS = {4: 0, 6: 1, 2: 2, 1: 3}
+'''Base point multiplier -> column of the points table in tables.py.'''
+
+DRAGON_KINDS = (TILE_INDEX['5Z'], TILE_INDEX['6Z'], TILE_INDEX['7Z'])
+RED_FIVES = ('0M', '0P', '0S')
+
+
+def get_wind_kind(wind) -> int:
+    """Get the tile kind for a wind enum, e.g. Winds.SOUTH -> index of '2Z'."""
+    return TILE_INDEX['1Z'] + wind.value - 1
+
+
+def get_dora_kind(indicator: str, is_three_player: bool) -> int:
+    """Get the dora tile kind pointed to by an indicator.
+    \n Suits wrap 9 -> 1, winds wrap North -> East and dragons wrap Red -> White.
+    \n In 3 player games manzu only has 1 and 9, so 1M points at 9M."""
+    kind = tile_kind(TILE_INDEX[indicator])
+    if kind < 27:
+        if is_three_player and kind == 0:
+            return 8
+        return kind - kind % 9 + (kind % 9 + 1) % 9
+    if kind < DRAGON_KINDS[0]:
+        return 27 + (kind - 27 + 1) % 4
+    return DRAGON_KINDS[0] + (kind - DRAGON_KINDS[0] + 1) % 3
+
+
+def count_han(game_state, player, winning_tile: str, is_tsumo: bool) -> tuple[int, int]:
+    """Count han and fu for a complete hand, returning (0, fu) when it has no yaku.
+    \n This is a simplified yaku set: riichi, menzen tsumo, tanyao, yakuhai, chiitoitsu and kokushi, plus dora.
+    \n Fu is fixed at 30, or 25 for chiitoitsu."""
+    concealed = player.hand + [winning_tile]
+    counts = hand_to_counts(concealed)
+
+    if is_kokushi(counts):
+        return YAKUMAN_HAN, DEFAULT_FU
+
+    called_tiles = [tile for call in player.calls if call.call_type != Calls.KITA for tile in call.tiles]
+    all_counts = hand_to_counts(concealed + called_tiles)
+
+    fu = DEFAULT_FU
+    han = 0
+    if player.is_in_riichi:
+        han += 1
+    if is_tsumo and is_closed_hand(player):
+        han += 1
+    if not any(all_counts[kind] for kind in TERMINAL_AND_HONOR_KINDS):
+        han += 1
+
+    if is_chiitoitsu(counts):
+        han += 2
+        fu = CHIITOITSU_FU
+    else:
+        for kind in DRAGON_KINDS:
+            if all_counts[kind] >= 3:
+                han += 1
+        if all_counts[get_wind_kind(player.seat)] >= 3:
+            han += 1
+        if all_counts[get_wind_kind(game_state.current_round_wind)] >= 3:
+            han += 1
+
+    if han == 0:
+        return 0, fu
+
+    wall = game_state.wall
+    revealed = wall.get_revealed_dora_indicators()
+    indicators = revealed + wall.ura_dora_indicators[:len(revealed)] if player.is_in_riichi else revealed
+    for indicator in indicators:
+        han += all_counts[get_dora_kind(indicator, game_state.is_three_player)]
+
+    han += sum(1 for tile in concealed + called_tiles if tile in RED_FIVES)
+    han += sum(1 for call in player.calls if call.call_type == Calls.KITA)
+
+    return han, fu
+
+
+def get_base_points(han: int, fu: int) -> int:
+    """Get the base points for a hand, capped by the limit hands from mangan upwards."""
+    for minimum_han, base_points in LIMIT_HANDS:
+        if han >= minimum_han:
+            return base_points
+
+    return min(fu * 2 ** (han + 2), MANGAN_BASE_POINTS)
+
+
+def round_up_points(points: int) -> int:
+    """Round points up to the next hundred."""
+    return -(-points // 100) * 100
+
+
+def get_payment(han: int, fu: int, multiplier: int) -> int:
+    """Get the base points times a multiplier, rounded up, from the hand tables when they are built."""
+    tables = get_tables()
+    if tables is not None:
+        points = tables.get_points(han, fu, POINT_TABLE_COLUMNS[multiplier])
+        if points is not None:
+            return points
+    return round_up_points(get_base_points(han, fu) * multiplier)
+
+
+def get_ron_points(han: int, fu: int, is_dealer: bool) -> int:
+    """Get the points the discarder pays for a ron, before honba."""
+    return get_payment(han, fu, 6 if is_dealer else 4)
+
+
+def get_tsumo_payments(han: int, fu: int, is_dealer: bool) -> tuple[int, int]:
+    """Get what the dealer and each non-dealer pay for a tsumo, before honba.
+    \n When the winner is the dealer, everyone pays the same amount."""
+    if is_dealer:
+        payment = get_payment(han, fu, 2)
+        return payment, payment
+    return get_payment(han, fu, 2), get_payment(han, fu, 1)
@@ -0,0 +1,194 @@
+import mmap
+import os
+import struct
+from itertools import combinations_with_replacement
+from operator import mul
+
+# Constants
+# Each suit (and the honors) is keyed by its tile counts read as a base-5 number,
+# key = sum(counts[i] * 5 ** i), so a table row is found without hashing.
+# The file is versioned and read through mmap, so every worker maps the same pages.
+TABLE_VERSION = 1
+MAGIC = b'RMHT'
+HEADER = struct.Struct('<4sII') # magic, version, section count
+SECTION = struct.Struct('<16sQQI') # name, offset, rows, row width in bytes
+
+SUIT_SIZE = 9
+HONOR_SIZE = 7
+POWERS_OF_FIVE = tuple(5 ** i for i in range(SUIT_SIZE))
+MAX_MELDS = 4
+
+DISTANCE_WIDTH = (MAX_MELDS + 1) * 2
+'''One byte per (melds, pair) target, at column melds * 2 + pair.'''
+
+FU_VALUES = (20, 25, 30, 40, 50, 60, 70, 80, 90, 100, 110)
+MAX_HAN = 13
+POINT_COLUMNS = 4
+'''Ron from a non-dealer win, ron from a dealer win, twice the base points and the base points, rounded up.'''
+
+TABLES_ENV = 'RIICHI_MAHJONG_TABLES'
+DEFAULT_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_tables.bin')
+
+
+def get_group_key(counts: list[int], start: int, size: int) -> int:
+    """Encode the counts of one suit or the honors as a base-5 key."""
+    return sum(map(mul, counts[start:start + size], POWERS_OF_FIVE))
+
+
+class HandTables():
+    """Class wrapping a memory-mapped hand table file.
+    \n Rows are read straight out of the mapping, nothing is copied into the process."""
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self.mapping)
+        magic, version, section_count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} hand table file, rebuild it with 'riichi-mahjong build-tables'.")
+
+        self.path: str = path
+        self.sections: dict[str, memoryview] = {}
+        for i in range(section_count):
+            name, offset, rows, width = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+            self.sections[name.rstrip(b'\0').decode()] = view[offset:offset + rows * width]
+
+        self.suit_distance: memoryview = self.sections['suit_distance']
+        self.honor_distance: memoryview = self.sections['honor_distance']
+        self.points: memoryview = self.sections['points'].cast('I')
+
+    def get_distance(self, is_honor: bool, key: int, melds: int, pair: int) -> int:
+        """Get how many tiles a group is missing to hold the given melds and pair."""
+        table = self.honor_distance if is_honor else self.suit_distance
+        return table[key * DISTANCE_WIDTH + melds * 2 + pair]
+
+    def get_points(self, han: int, fu: int, column: int) -> int | None:
+        """Look up a points value, or None when the han and fu fall outside the table."""
+        if han < 1 or fu not in FU_VALUES:
+            return None
+        row = (min(han, MAX_HAN) - 1) * len(FU_VALUES) + FU_VALUES.index(fu)
+        return self.points[row * POINT_COLUMNS + column]
+
+
+_tables: HandTables | None = None
+_tables_checked: bool = False
+
+
+def get_tables() -> HandTables | None:
+    """Return the shared hand tables, mapping them on first use.
+    \n The path comes from the RIICHI_MAHJONG_TABLES environment variable, falling back to the package directory.
+    \n Returns None when no table file has been built. A stale or foreign file raises ValueError on every call,
+    so callers never fall back to pure Python for some checks and not others."""
+    global _tables, _tables_checked
+    if not _tables_checked:
+        path = os.environ.get(TABLES_ENV, DEFAULT_TABLES_PATH)
+        if os.path.exists(path):
+            _tables = HandTables(path)
+        _tables_checked = True
+
+    return _tables
+
+
+def get_complete_shapes(size: int, melds: int, pair: int) -> list[tuple[int, ...]]:
+    """List every count vector for one group that is exactly the given melds plus an optional pair."""
+    meld_shapes: list[tuple[int, ...]] = []
+    for i in range(size):
+        meld_shapes.append(tuple(3 if j == i else 0 for j in range(size)))
+    if size == SUIT_SIZE:
+        for i in range(size - 2):
+            meld_shapes.append(tuple(1 if i <= j <= i + 2 else 0 for j in range(size)))
+
+    pair_positions = range(size) if pair else [None]
+    shapes: set[tuple[int, ...]] = set()
+    for chosen in combinations_with_replacement(meld_shapes, melds):
+        base = [sum(column) for column in zip(*chosen)] if chosen else [0] * size
+        for position in pair_positions:
+            counts = list(base)
+            if position is not None:
+                counts[position] += 2
+            if max(counts) <= 4:
+                shapes.add(tuple(counts))
+
+    return sorted(shapes)
+
+
+def build_distance_table(size: int):
+    """Build the (5 ** size, DISTANCE_WIDTH) distance table for a suit or the honors.
+    \n A group holding a complete shape is 0 away from it; anything else is one more than its best neighbour with an extra tile."""
+    import numpy as np
+
+    shape = (5,) * size
+    table = np.empty((5 ** size, DISTANCE_WIDTH), dtype=np.uint8)
+
+    for melds in range(MAX_MELDS + 1):
+        for pair in range(2):
+            contains = np.zeros(shape, dtype=bool)
+            for counts in get_complete_shapes(size, melds, pair):
+                contains[counts] = True
+            for axis in range(size):
+                contains = np.logical_or.accumulate(contains, axis=axis)
+
+            distance = np.where(contains, 0, 255).astype(np.int16)
+            while True:
+                relaxed = distance.copy()
+                for axis in range(size):
+                    lower = [slice(None)] * size
+                    upper = [slice(None)] * size
+                    lower[axis] = slice(0, 4)
+                    upper[axis] = slice(1, 5)
+                    np.minimum(relaxed[tuple(lower)], distance[tuple(upper)] + 1, out=relaxed[tuple(lower)])
+                if np.array_equal(relaxed, distance):
+                    break
+                distance = relaxed
+
+            # Fortran order puts the first axis fastest, matching key = sum(counts[i] * 5 ** i).
+            table[:, melds * 2 + pair] = distance.reshape(-1, order='F')
+
+    return table
+
+
+def build_points_table():
+    """Build the points table for every (han, fu) pair in FU_VALUES."""
+    import numpy as np
+    from .scoring import get_base_points, round_up_points
+
+    table = np.empty((MAX_HAN * len(FU_VALUES), POINT_COLUMNS), dtype='<u4')
+    for han in range(1, MAX_HAN + 1):
+        for i, fu in enumerate(FU_VALUES):
+            base_points = get_base_points(han, fu)
+            table[(han - 1) * len(FU_VALUES) + i] = (
+                round_up_points(base_points * 4),
+                round_up_points(base_points * 6),
+                round_up_points(base_points * 2),
+                round_up_points(base_points),
+            )
+
+    return table
+
+
+def build_tables(path: str = DEFAULT_TABLES_PATH) -> None:
+    """Generate every table and write them to a versioned binary file.
+    \n The file is written next to its final path and renamed, so running workers never map a partial file."""
+    sections = {
+        'suit_distance': build_distance_table(SUIT_SIZE),
+        'honor_distance': build_distance_table(HONOR_SIZE),
+        'points': build_points_table(),
+    }
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    offset += -offset % mmap.ALLOCATIONGRANULARITY
+    header = bytearray(HEADER.pack(MAGIC, TABLE_VERSION, len(sections)))
+    layout = []
+    for name, table in sections.items():
+        header += SECTION.pack(name.encode(), offset, table.shape[0], table.itemsize * table.shape[1])
+        layout.append((offset, table))
+        offset += table.nbytes
+        offset += -offset % mmap.ALLOCATIONGRANULARITY
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(header)
+        for section_offset, table in layout:
+            file.seek(section_offset)
+            file.write(table.tobytes())
+    os.replace(temporary_path, path)
@@ -4,6 +4,11 @@ from typing import TypeVar
 # Constants
 En = TypeVar('En', bound=Enum)
 
+TILE_KINDS = 34
+'''Distinct tiles once red fives are folded into their regular five.'''
+TILE_TYPES = 37
+'''Distinct tile strings, with 0M, 0P and 0S occupying the last three indices.'''
+
 
 def send_message(message:str) -> None:
     """Send a message to the console."""
@@ -116,4 +121,39 @@ def sort_key(tile: str) -> tuple[int, int]:
     elif suit == 'S':
         return (2, value)
     else:
-        return (3, value)
\ No newline at end of file
+        return (3, value)
+
+
+def _build_tile_index() -> dict[str, int]:
+    """Build the tile string -> index lookup used by the bitmask and count encodings."""
+    tile_index: dict[str, int] = {}
+    for suit in range(1, 4):
+        for value in range(1, 10):
+            tile_index[format_tile_name(value, suit)] = (suit - 1) * 9 + value - 1
+        tile_index[format_tile_name(0, suit)] = TILE_KINDS + suit - 1
+
+    for value in range(1, 8):
+        tile_index[format_tile_name(value, "Z")] = 27 + value - 1
+
+    return tile_index
+
+
+TILE_INDEX: dict[str, int] = _build_tile_index()
+INDEX_TILE: list[str] = sorted(TILE_INDEX, key=TILE_INDEX.__getitem__)
+
+
+def tile_kind(index: int) -> int:
+    """Fold a tile index into its kind, mapping red fives onto the regular five.
+    \n Example: index of '0P' -> index of '5P'."""
+    if index >= TILE_KINDS:
+        return (index - TILE_KINDS) * 9 + 4
+    return index
+
+
+def hand_to_counts(tiles: list[str]) -> list[int]:
+    """Count tiles per kind, with red fives counted as regular fives.
+    \n Example: ['5M', '0M', '1Z'] -> counts[4] == 2, counts[27] == 1."""
+    counts = [0] * TILE_KINDS
+    for tile in tiles:
+        counts[tile_kind(TILE_INDEX[tile])] += 1
+    return counts
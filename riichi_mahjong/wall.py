@@ -1,6 +1,6 @@
 import random
-from enums import Winds, Dragons
-from utils import format_tile_name
+from .enums import Winds, Dragons
+from .utils import format_tile_name
 
 # Constants
 COPIES = 4
@@ -29,9 +29,15 @@ class Wall():
         self.dora_indicators: list[dict] = [] # {'tile': isRevealed:bool}, i.e. {'5M': True}
         self.ura_dora_indicators: list[str] = [] # This one is only a list since it only matters if they are in riichi.
 
-    def setup_walls(self, game_state) -> None:
+        self.rng: random.Random = random.Random()
+        self.tile_sets: dict[bool, list[str]] = {} # Unshuffled tiles keyed by is_three_player, built once.
+
+    def setup_walls(self, game_state, seed: int | None = None) -> None:
         """Setup the walls for the game.
-        \n This includes the main wall, dead wall, and kan draw stack."""
+        \n This includes the main wall, dead wall, and kan draw stack.
+        \n Passing a seed makes the shuffle reproducible, so the same wall can be replayed."""
+        if seed is not None:
+            self.rng.seed(seed)
         self.setup_main_wall(game_state)
         self.setup_dead_wall()
 
@@ -82,10 +88,44 @@ class Wall():
             else:
                 self.dora_indicators.append({self.dead_wall[i]: False})
 
+    def draw_replacement_tile(self) -> str:
+        """Draw a replacement tile after a kan or kita.
+        \n The last tile of the main wall moves into the dead wall so it keeps its size.
+        \n Once the kan draw stack is used up, as it can be by kita, the replacement is the last tile of the main wall."""
+        if not self.kan_draw_stack:
+            return self.draw_tiles(-1)[0]
+
+        tile = self.draw_tile(self.kan_draw_stack)
+        if self.wall:
+            self.dead_wall.append(self.wall.pop())
+        return tile
+
+    def reveal_dora_indicator(self) -> None:
+        """Flip the next hidden dora indicator, if there is one."""
+        for indicator in self.dora_indicators:
+            for tile, is_revealed in indicator.items():
+                if not is_revealed:
+                    indicator[tile] = True
+                    return
+
+    def get_revealed_dora_indicators(self) -> list[str]:
+        """Return the dora indicators that have been flipped so far."""
+        return [tile for indicator in self.dora_indicators for tile, is_revealed in indicator.items() if is_revealed]
+
     def setup_main_wall(self, game_state) -> None:
-        """Setup the main wall with tiles."""
-        self.wall.clear()
-        wall  = self.wall
+        """Setup the main wall with tiles.
+        \n The unshuffled tile set is only built once per player count and copied for each hand."""
+        tiles = self.tile_sets.get(game_state.is_three_player)
+        if tiles is None:
+            tiles = self.build_tile_set(game_state)
+            self.tile_sets[game_state.is_three_player] = tiles
+
+        self.wall[:] = tiles
+        self.rng.shuffle(self.wall)
+
+    def build_tile_set(self, game_state) -> list[str]:
+        """Build the unshuffled list of every tile in play."""
+        wall: list[str] = []
 
         # Main wall setup.
         for copy in range(COPIES):
@@ -100,20 +140,20 @@ class Wall():
                     if copy == 0 and value == 5:
                         continue
                     
-                    self.append_tile_to_wall(value, suit)
+                    self.append_tile_to_wall(value, suit, wall)
 
             for wind in Winds:
-                self.append_tile_to_wall(wind.value, "Z")
+                self.append_tile_to_wall(wind.value, "Z", wall)
 
             for dragon in Dragons:
-                self.append_tile_to_wall(dragon.value, "Z")
+                self.append_tile_to_wall(dragon.value, "Z", wall)
 
         # Add red fives.
         for suit in range(1, 4):
             if game_state.is_three_player and suit == 1:
                 continue
             
-            self.append_tile_to_wall(0, suit)
+            self.append_tile_to_wall(0, suit, wall)
 
-        random.shuffle(wall)
+        return wall
         # Pasta
\ No newline at end of file
@@ -0,0 +1,64 @@
+from riichi_mahjong.actions import legal_actions, is_legal, iter_actions, DISCARD_OFFSET, KITA_ACTION
+from riichi_mahjong.call_logic import CallOption, check_set_call, find_chii_options
+from riichi_mahjong.enums import Calls
+from riichi_mahjong.game_manager import GameState, Player, seat_players
+from riichi_mahjong.match import declare_call
+from riichi_mahjong.utils import INDEX_TILE, TILE_TYPES
+
+
+def get_discards(mask: int) -> set[str]:
+    return {INDEX_TILE[action - DISCARD_OFFSET] for action in iter_actions(mask) if action < DISCARD_OFFSET + TILE_TYPES}
+
+
+def test_chii_kuikae_bans_called_tile_and_suji():
+    player = Player()
+    player.hand = ['2S', '3S', '1S', '4S', '6S', '7M', '8M', '9M', '1P', '1P', '5Z']
+    options = find_chii_options(player.hand, '4S')
+    edge = next(option for option in options if sorted(option.tiles_used) == ['2S', '3S'])
+    assert edge.kuikae_restrictions == {'1S', '4S'}
+
+    player.hand = ['1S', '4S', '6S', '7M', '8M', '9M', '1P', '1P', '5Z']
+    discards = get_discards(legal_actions(player, GameState(), edge))
+    assert discards == {'6S', '7M', '8M', '9M', '1P', '5Z'}
+
+
+def test_chii_kuikae_covers_red_five():
+    options = find_chii_options(['3P', '4P', '0P', '9M'], '5P')
+    edge = next(option for option in options if sorted(option.tiles_used) == ['3P', '4P'])
+    assert edge.kuikae_restrictions == {'5P', '0P', '2P'}
+
+
+def test_calls_that_leave_no_legal_discard_are_not_offered():
+    options = find_chii_options(['2S', '3S', '4S', '1S'], '4S')
+    assert not any(sorted(option.tiles_used) == ['2S', '3S'] for option in options)
+
+    call_options: list[CallOption] = []
+    check_set_call(['5P', '5P', '0P', '5P'], ['5P', '5P', '5P'], '5P', call_options, Calls.PON, 2)
+    assert call_options == []
+
+    check_set_call(['5P', '5P', '1Z', '2Z'], ['5P', '5P'], '5P', call_options, Calls.PON, 2)
+    assert [option.call_type for option in call_options] == [Calls.PON]
+
+
+def test_kita_in_riichi_needs_drawn_north():
+    game_state = GameState()
+    seat_players(game_state, 3)
+    game_state.tiles_left = 20
+    game_state.kan_count = 0
+    game_state.wall.kan_draw_stack[:] = ['1P', '2P', '3P', '4P']
+    player = game_state.players[0]
+    player.calls.clear()
+    player.is_in_riichi = True
+    # Tanki wait on North.
+    player.hand = ['1P', '2P', '3P', '4P', '5P', '6P', '7P', '8P', '9P', '1S', '1S', '1S', '4Z']
+
+    player.drawn_tile = '2S'
+    assert not is_legal(legal_actions(player, game_state), KITA_ACTION)
+
+    player.drawn_tile = '4Z'
+    assert is_legal(legal_actions(player, game_state), KITA_ACTION)
+    hand = list(player.hand)
+    declare_call(game_state, player, KITA_ACTION)
+    assert player.hand == hand
+    assert player.calls[-1].tiles == ['4Z']
+    assert player.drawn_tile == '1P'
@@ -0,0 +1,38 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from riichi_mahjong.enums import Calls
+from riichi_mahjong.features import encode_state, unpack_features, FEATURE_SIZE
+from riichi_mahjong.match import RandomAgent, play_match
+
+
+class CheckingAgent(RandomAgent):
+    """Random agent that checks the encoding of every state it acts on against the table."""
+    def __init__(self, seed: int) -> None:
+        super().__init__(seed)
+        self.most_kita = 0
+
+    def choose_action(self, game_state, player, actions: int) -> int:
+        row = bytearray(FEATURE_SIZE)
+        encode_state(game_state, player, row)
+
+        features = unpack_features(np.frombuffer(bytes(row), dtype=np.uint8).reshape(1, FEATURE_SIZE))
+        kita = sum(1 for call in player.calls if call.call_type == Calls.KITA)
+        assert features['hand'].sum() == len(player.hand) + 1
+        assert features['kita'][0, 0] == kita
+        assert features['discards'][0, 0].astype(bool).sum() == len(player.discard_pile)
+        assert features['calls'][0, 0, :, 0].astype(bool).sum() == len(player.calls) - kita
+        self.most_kita = max(self.most_kita, kita)
+
+        return super().choose_action(game_state, player, actions)
+
+
+@pytest.mark.parametrize('player_count', [3, 4])
+def test_encoding_matches_table(player_count):
+    agents = [CheckingAgent(seat) for seat in range(player_count)]
+    for seed in range(3):
+        play_match(agents, is_east_only=True, seed=seed)
+
+    if player_count == 3:
+        assert max(agent.most_kita for agent in agents) >= 2
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from riichi_mahjong import league as league_module
+from riichi_mahjong.league import League, get_t_quantile, run_league
+
+
+def blocks_until_decided(mean: float, seed: int) -> int:
+    rng = random.Random(seed)
+    league = League(['shanten', 'random', 'random'])
+    while not league.is_decided(min_blocks=10, precision=0.05):
+        league.differences.append(rng.gauss(mean, 0.5))
+    return len(league.differences)
+
+
+def test_clear_difference_stops_well_before_a_null_one():
+    clear = [blocks_until_decided(-0.5, seed) for seed in range(20)]
+    null = [blocks_until_decided(0.0, seed) for seed in range(20)]
+    assert sorted(clear)[len(clear) // 2] <= 20 and max(clear) <= 50
+    # With no difference it should mostly run until the width stops it, near (1.96 * 0.5 / 0.05) ** 2 blocks,
+    # and only stop early about SEQUENCE_ALPHA of the time.
+    assert sorted(null)[len(null) // 2] > 300
+    assert sum(1 for blocks in null if blocks < 300) <= 3
+
+
+def test_confidence_sequence_is_wider_than_the_interval():
+    league = League(['shanten', 'random', 'random'])
+    league.differences = [-0.5, -0.9, -0.1, -0.5, -0.4, -0.6, -0.8, -0.2, -0.3, -0.7]
+    mean, lower, upper = league.get_confidence_interval()
+    sequence_mean, sequence_lower, sequence_upper = league.get_confidence_sequence()
+    assert sequence_mean == mean
+    assert sequence_lower < lower and upper < sequence_upper
+    assert sequence_upper < 0
+    assert league.is_decided(min_blocks=10, precision=0.05)
+    assert not league.is_decided(min_blocks=11, precision=0.05)
+
+
+def test_t_quantile_approaches_normal():
+    assert get_t_quantile(1) == pytest.approx(12.706)
+    assert get_t_quantile(3) == pytest.approx(3.182, abs=0.005)
+    assert get_t_quantile(10) == pytest.approx(2.228, abs=0.001)
+    assert get_t_quantile(10000) == pytest.approx(1.96, abs=0.001)
+
+
+def test_run_league_rejects_bad_lineups_before_playing(monkeypatch):
+    with pytest.raises(ValueError):
+        run_league(['shanten', 'random'], max_blocks=1, report=lambda _: None)
+
+    monkeypatch.setattr(league_module, 'get_tables', lambda: None)
+    with pytest.raises(FileNotFoundError):
+        run_league(['shanten', 'random', 'random'], max_blocks=1, report=lambda _: None)
@@ -0,0 +1,155 @@
+import pytest
+
+from riichi_mahjong.actions import legal_actions, is_legal, ADDED_KAN_OFFSET, CLOSED_KAN_OFFSET, KITA_ACTION, \
+    KYUUSHU_ACTION
+from riichi_mahjong.enums import Calls, Furiten, HandOutcome, Winds
+from riichi_mahjong.game_manager import GameState, CalledTile, seat_players, start_hand
+from riichi_mahjong.utils import TILE_INDEX
+from riichi_mahjong.match import Agent, RandomAgent, declare_call, find_ron, is_abortive_draw, play_hand, \
+    reveal_pending_dora
+
+
+def test_kita_with_empty_kan_draw_stack_takes_last_wall_tile():
+    game_state = GameState()
+    seat_players(game_state, 3)
+    wall = game_state.wall
+    wall.kan_draw_stack.clear()
+    wall.wall[:] = ['7P']
+    game_state.tiles_left = 1
+    game_state.kan_count = 0
+
+    player = game_state.players[0]
+    player.calls.clear()
+    player.is_in_riichi = False
+    player.hand = ['1P', '2P', '3P', '4P', '5P', '6P', '7S', '8S', '9S', '1S', '1S', '3Z', '3Z']
+    player.drawn_tile = '4Z'
+
+    assert is_legal(legal_actions(player, game_state), KITA_ACTION)
+    declare_call(game_state, player, KITA_ACTION)
+    assert player.drawn_tile == '7P'
+    assert game_state.tiles_left == 0
+
+
+def test_suukaikan_aborts_three_player_hand():
+    game_state = GameState()
+    seat_players(game_state, 3)
+    for player in game_state.players:
+        player.calls.clear()
+        player.is_in_riichi = False
+
+    kans = [Calls.CLOSED_KAN, Calls.CLOSED_KAN, Calls.ADDED_KAN, Calls.CLOSED_KAN]
+    for i, call_type in enumerate(kans):
+        called = CalledTile()
+        called.call_type = call_type
+        game_state.players[i % 2].calls.append(called)
+    game_state.kan_count = len(kans)
+    game_state.turn_number = 10
+    assert is_abortive_draw(game_state)
+
+    game_state.players[1].calls.clear()
+    assert not is_abortive_draw(game_state)
+
+
+def test_winning_tile_without_yaku_makes_player_furiten():
+    game_state = GameState()
+    seat_players(game_state, 4)
+    game_state.wall.dora_indicators.clear()
+    for player in game_state.players:
+        player.calls.clear()
+        player.discard_pile.clear()
+        player.hand = []
+        player.is_in_riichi = False
+        player.furiten_status = Furiten.NONE
+
+    # Waiting on 1P or 4P, with terminals and no yakuhai there is no yaku for a ron.
+    waiting = game_state.get_player(Winds.SOUTH)
+    waiting.hand = ['1M', '2M', '3M', '4P', '5P', '6P', '7S', '8S', '9S', '1S', '1S', '2P', '3P']
+    agents = [RandomAgent(seat) for seat in range(4)]
+
+    assert find_ron(game_state, agents, game_state.get_player(Winds.EAST), '1P') is None
+    assert waiting.furiten_status == Furiten.TEMPORARY
+
+
+class KyuushuAgent(RandomAgent):
+    """Random agent that aborts every hand it can with kyuushu kyuuhai."""
+    declared = False
+
+    def choose_action(self, game_state, player, actions: int) -> int:
+        if is_legal(actions, KYUUSHU_ACTION):
+            KyuushuAgent.declared = True
+            return KYUUSHU_ACTION
+        return super().choose_action(game_state, player, actions)
+
+
+def test_kyuushu_kyuuhai_only_on_first_uninterrupted_draw():
+    game_state = GameState()
+    seat_players(game_state, 4)
+    game_state.tiles_left = 60
+    for player in game_state.players:
+        player.calls.clear()
+        player.discard_pile.clear()
+        player.is_in_riichi = False
+
+    player = game_state.players[0]
+    player.hand = ['1M', '9M', '1P', '9P', '1S', '9S', '1Z', '2Z', '5P', '6P', '7P', '3S', '4S']
+    player.drawn_tile = '5Z'
+    assert is_legal(legal_actions(player, game_state), KYUUSHU_ACTION)
+
+    player.drawn_tile = '5S'
+    assert not is_legal(legal_actions(player, game_state), KYUUSHU_ACTION)
+
+    player.drawn_tile = '5Z'
+    called = CalledTile()
+    called.call_type = Calls.KITA
+    game_state.players[1].calls.append(called)
+    assert not is_legal(legal_actions(player, game_state), KYUUSHU_ACTION)
+
+
+def test_kyuushu_kyuuhai_aborts_hand():
+    game_state = GameState()
+    seat_players(game_state, 4)
+    agents = [KyuushuAgent(seat) for seat in range(4)]
+    for seed in range(300):
+        KyuushuAgent.declared = False
+        result = play_hand(game_state, agents, seed)
+        if KyuushuAgent.declared:
+            assert result.outcome == HandOutcome.ABORTIVE_DRAW
+            assert game_state.turn_number <= len(agents)
+            return
+    assert False, "no seed dealt a kyuushu kyuuhai hand"
+
+
+def test_added_kan_dora_waits_for_the_discard():
+    game_state = GameState()
+    seat_players(game_state, 4)
+    start_hand(game_state, seed=0)
+    wall = game_state.wall
+    player = game_state.players[0]
+
+    pon = CalledTile()
+    pon.call_type = Calls.PON
+    pon.tiles = ['7S', '7S', '7S']
+    player.calls.append(pon)
+    player.hand = ['1M', '2M', '3M', '1P', '1P', '1P', '4P', '5P', '6P', '2Z']
+    player.drawn_tile = '7S'
+
+    declare_call(game_state, player, ADDED_KAN_OFFSET + TILE_INDEX['7S'])
+    assert len(wall.get_revealed_dora_indicators()) == 1
+    assert game_state.pending_dora_reveals == 1
+
+    # A closed kan before the discard flips the added kan's dora and its own.
+    player.hand = ['1M', '2M', '3M', '1P', '1P', '1P', '4P', '5P', '6P', '2Z']
+    player.drawn_tile = '1P'
+    declare_call(game_state, player, CLOSED_KAN_OFFSET + TILE_INDEX['1P'])
+    assert len(wall.get_revealed_dora_indicators()) == 3
+    reveal_pending_dora(game_state)
+    assert len(wall.get_revealed_dora_indicators()) == 3
+
+
+def test_agent_without_choose_action_cannot_be_constructed():
+    class RonOnlyAgent(Agent):
+        def choose_ron(self, game_state, player, tile: str) -> bool:
+            return False
+
+    with pytest.raises(TypeError):
+        RonOnlyAgent()
@@ -0,0 +1,107 @@
+import random
+import pytest
+
+from riichi_mahjong import agari, tables
+from riichi_mahjong.utils import TILE_KINDS
+
+WALL = [kind for kind in range(TILE_KINDS) for _ in range(4)]
+
+
+@pytest.fixture(scope='module')
+def hand_tables(tmp_path_factory):
+    pytest.importorskip('numpy')
+    path = str(tmp_path_factory.mktemp('tables') / 'hand_tables.bin')
+    tables.build_tables(path)
+    return tables.HandTables(path)
+
+
+def get_random_counts(rng: random.Random, size: int, concentrated: bool) -> list[int]:
+    """Deal random counts, optionally mostly from one suit so complete shapes come up often."""
+    pool = [kind for kind in WALL if kind < 9 or rng.random() < 0.3] if concentrated else WALL
+    counts = [0] * TILE_KINDS
+    for kind in rng.sample(pool, size):
+        counts[kind] += 1
+    return counts
+
+
+def get_tenpai_counts(rng: random.Random) -> list[int] | None:
+    """Build a complete hand of four melds and a pair, then take one tile out."""
+    counts = [0] * TILE_KINDS
+    for _ in range(4):
+        if rng.random() < 0.5:
+            start = rng.randrange(3) * 9 + rng.randrange(7)
+            for kind in range(start, start + 3):
+                counts[kind] += 1
+        else:
+            counts[rng.randrange(TILE_KINDS)] += 3
+    counts[rng.randrange(TILE_KINDS)] += 2
+    if max(counts) > 4:
+        return None
+
+    counts[rng.choice([kind for kind in range(TILE_KINDS) if counts[kind]])] -= 1
+    return counts
+
+
+def test_table_waits_match_pure_python(hand_tables, monkeypatch):
+    monkeypatch.setattr(agari, 'get_tables', lambda: None)
+    rng = random.Random(0)
+    for i in range(20000):
+        counts = get_random_counts(rng, rng.choice([1, 4, 7, 10, 13]), i % 2 == 1)
+        assert agari.get_waits_from_tables(hand_tables, counts) == agari.get_waits(counts), counts
+
+        completed = list(counts)
+        completed[rng.randrange(TILE_KINDS)] += 1
+        if max(completed) <= 4:
+            expected = agari.is_standard_agari(completed)
+            assert agari.is_standard_agari_from_tables(hand_tables, completed) == expected, completed
+
+    for _ in range(5000):
+        counts = get_tenpai_counts(rng)
+        if counts is not None:
+            waits = agari.get_waits(counts)
+            assert waits
+            assert agari.get_waits_from_tables(hand_tables, counts) == waits, counts
+
+
+def test_shanten_matches_waits_and_single_exchanges(hand_tables, monkeypatch):
+    rng = random.Random(1)
+    for i in range(3000):
+        counts = get_random_counts(rng, 13, False)
+        monkeypatch.setattr(agari, 'get_tables', lambda: None)
+        is_tenpai = agari.get_waits(counts) != 0
+        monkeypatch.setattr(agari, 'get_tables', lambda: hand_tables)
+        shanten = agari.get_shanten(counts)
+        assert (shanten == 0) == is_tenpai or max(counts) == 4, counts
+
+        if shanten <= 0 or i >= 30:
+            continue
+        # Swapping one tile can lower shanten by at most one, and the best swap always does.
+        best = shanten
+        for added in range(TILE_KINDS):
+            if counts[added] == 4:
+                continue
+            counts[added] += 1
+            for removed in range(TILE_KINDS):
+                if counts[removed] and removed != added:
+                    counts[removed] -= 1
+                    best = min(best, agari.get_shanten(counts))
+                    counts[removed] += 1
+            counts[added] -= 1
+        assert best == shanten - 1, counts
+
+    for _ in range(500):
+        counts = get_tenpai_counts(rng)
+        if counts is not None:
+            assert agari.get_shanten(counts) == 0
+
+
+def test_stale_table_file_is_rejected_every_time(tmp_path, monkeypatch):
+    path = tmp_path / 'hand_tables.bin'
+    path.write_bytes(tables.HEADER.pack(tables.MAGIC, tables.TABLE_VERSION + 1, 0).ljust(4096, b'\0'))
+    monkeypatch.setenv(tables.TABLES_ENV, str(path))
+    monkeypatch.setattr(tables, '_tables', None)
+    monkeypatch.setattr(tables, '_tables_checked', False)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            tables.get_tables()